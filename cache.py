@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for Claude CLI responses.
+
+Path shortening is deterministic for a given prompt and input path, so the
+response is stored in a small sqlite database and reused on later runs
+(e.g. dry run followed by --apply, or re-runs after partial failures).
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "volvo-usb-verifier" / "paths.db"
+
+
+class LLMCache:
+    """
+    Thread-safe sqlite key/value store for LLM responses.
+
+    Values are the response strings themselves, stored as TEXT with no
+    serialization layer in between.
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, enabled=True):
+        self.db_path = Path(db_path)
+        self.enabled = enabled
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt_version, prompt_input):
+        """Build a cache key from the prompt version and the prompt input."""
+        return hashlib.sha256(f"{prompt_version}|{prompt_input}".encode('utf-8')).hexdigest()
+
+    def _connect(self):
+        """Open the database on first use (caller must hold the lock)."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            # Cached responses can always be recomputed, so trade durability
+            # for speed: WAL avoids rewriting the database on every commit
+            # and NORMAL sync skips an fsync per stored response
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT value FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def set(self, key, value):
+        """Store value under key. Cache failures are never fatal."""
+        if not self.enabled:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", (key, value)
+                )
+                conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Long-lived Claude CLI sessions.
+
+Starting `claude --print` for every prompt pays the CLI start-up cost
+(runtime, auth, handshake) each time. A session keeps one `claude` process
+running in stream-json mode and sends prompts over stdin instead.
+
+Every prompt sent to a session becomes part of its conversation, so
+sessions are restarted after a fixed number of prompts to keep the context
+(and token cost) bounded.
+"""
+
+import json
+import queue
+import subprocess
+import threading
+import time
+
+# Prompts answered by one process before it is restarted
+SESSION_MAX_PROMPTS = 25
+
+
+class ClaudeSession:
+    """A single `claude` process answering prompts over stdin/stdout."""
+
+    COMMAND = [
+        'claude', '--print',
+        '--input-format', 'stream-json',
+        '--output-format', 'stream-json',
+        '--verbose',
+    ]
+
+    def __init__(self, max_prompts=SESSION_MAX_PROMPTS, system_prompt=None):
+        self.max_prompts = max_prompts
+        self.system_prompt = system_prompt
+        self.proc = None
+        self.lines = None
+        self.prompts = 0
+
+    def _start(self):
+        """Start the claude process and a reader thread for its output."""
+        cmd = list(self.COMMAND)
+        if self.system_prompt:
+            cmd += ['--append-system-prompt', self.system_prompt]
+
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            bufsize=1,
+            close_fds=False
+        )
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read, args=(self.proc.stdout, self.lines), daemon=True).start()
+        self.prompts = 0
+
+    @staticmethod
+    def _read(stream, lines):
+        """Forward output lines to the queue; None marks end of output."""
+        for line in stream:
+            lines.put(line)
+        lines.put(None)
+
+    def ask(self, prompt, timeout=30):
+        """
+        Send one prompt and return the response text, or None if the process exited.
+
+        Raises subprocess.TimeoutExpired if no response arrives in time; the
+        process is killed so a late answer cannot be read by the next prompt.
+        """
+        if self.proc is None or self.proc.poll() is not None or self.prompts >= self.max_prompts:
+            self.close()
+            self._start()
+        self.prompts += 1
+
+        message = {'type': 'user', 'message': {'role': 'user', 'content': prompt}}
+        self.proc.stdin.write(json.dumps(message) + '\n')
+        self.proc.stdin.flush()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.close()
+                raise subprocess.TimeoutExpired(self.COMMAND, timeout)
+            try:
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+
+            if line is None:
+                return None
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event.get('type') == 'result':
+                return event.get('result')
+
+    def close(self):
+        """Stop the claude process if it is running."""
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        self.proc.kill()
+        self.proc.wait()
+        self.proc = None
+
+
+class ClaudeSessionPool:
+    """One ClaudeSession per thread and system prompt, so workers never share a process."""
+
+    def __init__(self, enabled=False, max_prompts=SESSION_MAX_PROMPTS):
+        self.enabled = enabled
+        self.max_prompts = max_prompts
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def ask(self, prompt, timeout=30, system_prompt=None):
+        """Send a prompt using the calling thread's session for that system prompt."""
+        sessions = getattr(self._local, 'sessions', None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+
+        session = sessions.get(system_prompt)
+        if session is None:
+            session = sessions[system_prompt] = ClaudeSession(self.max_prompts, system_prompt)
+            with self._lock:
+                self._sessions.append(session)
+        return session.ask(prompt, timeout)
+
+    def close(self):
+        """Stop every session started by the pool."""
+        with self._lock:
+            for session in self._sessions:
+                session.close()
@@ -7,45 +7,70 @@ Usage:
     python rename_audiobooks.py --apply            # Actually rename files
     python rename_audiobooks.py --test             # Run tests first
     python rename_audiobooks.py --limit 10         # Process only first 10 files
+    python rename_audiobooks.py --workers 4        # Limit parallel Claude calls
+    python rename_audiobooks.py --batch-size 5     # Send 5 paths per Claude call
+    python rename_audiobooks.py --no-cache         # Ignore cached Claude responses
+    python rename_audiobooks.py --persistent       # Reuse long-lived claude processes
 """
 
 import subprocess
+import errno
+import functools
+import itertools
 import os
+import queue
+import re
 import sys
 import shutil
+import threading
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# The winning prompt from testing
-V7_PROMPT = """Shorten audiobook path. Remove redundancy, keep hierarchy. Extract part/disc into filename.
+from cache import LLMCache
+from claude_session import ClaudeSessionPool
+from rules import extract_track_number, try_rule_based_shorten
 
-Examples:
-books\\1984 (George Orwell) - Audio Book\\Audio Books - George Orwell - 1984 - 1 of 14.mp3
-→ books/1984/01.mp3
-
-books\\Aldous Huxley's - Brave New World\\Brave New World - 01 of 10.mp3
-→ books/Brave New World/01.mp3
-
-books\\Harry Potter (Jim Dale)\\(1997) Harry Potter And The Philosopher's Stone\\Chapter 01 - The Boy Who Lived.mp3
-→ books/Harry Potter/1997 - HP & Philosopher's Stone/01.mp3
+# Bump whenever V7_PROMPT changes so cached responses from the old prompt are ignored
+PROMPT_VERSION = "v7_refined.1"
 
-books\\Harry Potter (Jim Dale)\\(1998) Harry Potter And The Chamber Of Secrets\\Chapter 01 - The Worst Birthday.mp3
-→ books/Harry Potter/1998 - HP & Chamber of Secrets/01.mp3
+# Shared response cache (opened lazily on first lookup)
+CACHE = LLMCache()
 
-books\\The Hobbit Audiobook\\The Hobbit (Disc 01)\\1-01 Ch 1a, An Unexpected Party.mp3
-→ books/Hobbit/1-01.mp3
+# Long-lived claude processes, used instead of one process per call when enabled
+SESSIONS = ClaudeSessionPool()
 
-books\\Roald Dahl Audiobooks\\Roald Dahl - Charlie and the Chocolate Factory\\(Roald Dahl) Charlie and the Chocolate Factory (Part 1) - 01.mp3
-→ books/Roald Dahl/Charlie & Chocolate Factory/1-01.mp3
+# The winning prompt from testing, split into a static prefix (examples and
+# rules, identical on every call so the provider can cache it) and a dynamic
+# suffix holding the path. The path must always come last.
+V7_PROMPT_HEADER = """Shorten audiobook path. Remove redundancy, keep hierarchy. Extract part/disc into filename.
 
-books\\Roald Dahl Audiobooks\\Roald Dahl - Charlie and the Chocolate Factory\\(Roald Dahl) Charlie and the Chocolate Factory (Part 3) - 10.mp3
-→ books/Roald Dahl/Charlie & Chocolate Factory/3-10.mp3
-
-books\\William Gibson-Collection\\William Gibson-Blue Ant Trilogy[1-3]\\William Gibson-Blue Ant Trilogy-#1-Pattern Recognition\\Pattern Recognition - 001.mp3
-→ books/William Gibson/Blue Ant Trilogy/Pattern Recognition/001.mp3
+Examples:
+"""
 
-books\\Gulliver's Travels\\01 Voyage to Liliput.mp3
-→ books/Gulliver's Travels/01.mp3
+# Few-shot examples tagged with the path features they demonstrate
+V7_EXAMPLES = [
+    ({'of', 'author'}, """books\\1984 (George Orwell) - Audio Book\\Audio Books - George Orwell - 1984 - 1 of 14.mp3
+→ books/1984/01.mp3"""),
+    ({'of', 'author'}, """books\\Aldous Huxley's - Brave New World\\Brave New World - 01 of 10.mp3
+→ books/Brave New World/01.mp3"""),
+    ({'year', 'series', 'author'}, """books\\Harry Potter (Jim Dale)\\(1997) Harry Potter And The Philosopher's Stone\\Chapter 01 - The Boy Who Lived.mp3
+→ books/Harry Potter/1997 - HP & Philosopher's Stone/01.mp3"""),
+    ({'year', 'series', 'author'}, """books\\Harry Potter (Jim Dale)\\(1998) Harry Potter And The Chamber Of Secrets\\Chapter 01 - The Worst Birthday.mp3
+→ books/Harry Potter/1998 - HP & Chamber of Secrets/01.mp3"""),
+    ({'disc'}, """books\\The Hobbit Audiobook\\The Hobbit (Disc 01)\\1-01 Ch 1a, An Unexpected Party.mp3
+→ books/Hobbit/1-01.mp3"""),
+    ({'part', 'author'}, """books\\Roald Dahl Audiobooks\\Roald Dahl - Charlie and the Chocolate Factory\\(Roald Dahl) Charlie and the Chocolate Factory (Part 1) - 01.mp3
+→ books/Roald Dahl/Charlie & Chocolate Factory/1-01.mp3"""),
+    ({'part', 'author'}, """books\\Roald Dahl Audiobooks\\Roald Dahl - Charlie and the Chocolate Factory\\(Roald Dahl) Charlie and the Chocolate Factory (Part 3) - 10.mp3
+→ books/Roald Dahl/Charlie & Chocolate Factory/3-10.mp3"""),
+    ({'series'}, """books\\William Gibson-Collection\\William Gibson-Blue Ant Trilogy[1-3]\\William Gibson-Blue Ant Trilogy-#1-Pattern Recognition\\Pattern Recognition - 001.mp3
+→ books/William Gibson/Blue Ant Trilogy/Pattern Recognition/001.mp3"""),
+    ({'simple'}, """books\\Gulliver's Travels\\01 Voyage to Liliput.mp3
+→ books/Gulliver's Travels/01.mp3"""),
+]
+
+V7_PROMPT_RULES = """
 
 Rules:
 - Extract "Part N" or "Disc N" from filename → format as N-tracknum.mp3
@@ -56,141 +81,536 @@ Rules:
 - Keep years in parentheses for series (e.g., 1997, 1998)
 - Abbreviate long book titles in series
 
-Path: {path}
+"""
+
+V7_PROMPT_STATIC = V7_PROMPT_HEADER + '\n\n'.join(block for _, block in V7_EXAMPLES) + V7_PROMPT_RULES
+
+V7_PROMPT_DYNAMIC = """Path: {path}
 Output (path only, no markdown, no explanation):"""
 
+# Same examples and rules, but for a numbered list of paths in one call
+BATCH_V7_PROMPT_DYNAMIC = """Paths:
+{paths}
+Output one shortened path per input line, numbered to match (e.g. "1. books/..."), no markdown, no explanation:"""
+
+assert '{' not in V7_PROMPT_STATIC, "V7_PROMPT_STATIC must not contain placeholders"
+
+V7_PROMPT = V7_PROMPT_STATIC + V7_PROMPT_DYNAMIC
+
+# The dynamic parts are split once around their placeholder so each call is
+# a plain concatenation instead of a str.format parse
+assert V7_PROMPT_DYNAMIC.count('{path}') == 1
+assert BATCH_V7_PROMPT_DYNAMIC.count('{paths}') == 1
+_PATH_PREFIX, _PATH_SUFFIX = V7_PROMPT_DYNAMIC.split('{path}')
+_BATCH_PREFIX, _BATCH_SUFFIX = BATCH_V7_PROMPT_DYNAMIC.split('{paths}')
+
+# Examples sent with single-path prompts (batches always get all of them)
+MAX_EXAMPLES = 3
+
+# Cheap surface features used to pick the most relevant examples for a path,
+# as (weight, pattern); "author" is common, so it counts for less
+EXAMPLE_FEATURES = {
+    'of': (2, re.compile(r'\d+\s+of\s+\d+', re.IGNORECASE)),
+    'part': (2, re.compile(r'\bPart\s*\d+', re.IGNORECASE)),
+    'disc': (2, re.compile(r'\b(?:Disc|Disk|CD)\s*\d+', re.IGNORECASE)),
+    'year': (2, re.compile(r'\(\d{4}\)')),
+    'series': (2, re.compile(r'#\d|\[|Collection|Trilogy|Series|\(\d{4}\)', re.IGNORECASE)),
+    'author': (1, re.compile(r"\((?!\d{4}\)|[^)]*\b(?:Part|Disc|Disk|CD)\b)[^)]*\)|'s - | - ", re.IGNORECASE)),
+}
+
+# Number of paths sent to Claude per batched call
+BATCH_SIZE = 20
+
+BATCH_LINE_RE = re.compile(r'^\s*(\d+)[.)]\s+(.+)$')
+
+# Cheap local check of a shortened path; a mismatch gets one stricter retry
+VALID_PATH_RE = re.compile(r'^books/.+\.mp3$', re.IGNORECASE)
+STRICT_SUFFIX = f"\nThe output MUST match this regex: {VALID_PATH_RE.pattern}"
+
+# Single-character slash conversions (str.translate is cheaper than replace)
+TO_FORWARD_SLASHES = str.maketrans('\\', '/')
+TO_BACKSLASHES = str.maketrans('/', '\\')
+
+# Parallel file renames when applying changes
+RENAME_WORKERS = 8
+
+
+def parse_claude_output(output):
+    """Extract the shortened path from raw Claude CLI output."""
+    # Scan lines from the end; the answer is almost always the last line,
+    # so earlier lines are usually never sliced or cleaned
+    last = None
+    end = len(output)
+    while end > 0:
+        start = output.rfind('\n', 0, end)
+        cleaned = output[start + 1:end].replace('`', '').replace('**', '').strip()
+        end = start
+        if not cleaned:
+            continue
 
-def get_shortened_path(original_path, base_dir):
-    """Use Claude CLI to get shortened path for a file."""
-    # Get path relative to base_dir for the prompt
-    try:
-        rel_path = Path(original_path).relative_to(Path(base_dir).parent)
-    except ValueError:
-        # If not relative, use as-is
-        rel_path = original_path
+        lower = cleaned.lower()
+        if last is None:
+            last = (cleaned, lower)
 
-    # Format path with backslashes for consistency with examples
-    prompt_path = str(rel_path).replace('/', '\\')
-    prompt = V7_PROMPT.format(path=prompt_path)
+        # Skip error messages
+        if 'error' in lower or 'timeout' in lower:
+            continue
+
+        # Find the line that looks like a path
+        if 'books/' in lower and '.mp3' in lower:
+            # Remove any prefix like "Shortened:" or similar
+            if ':' in cleaned:
+                cleaned = cleaned.split(':', 1)[1].strip()
+            return cleaned
 
+    # Fallback to last line
+    if last:
+        cleaned, lower = last
+
+        # Don't return error messages
+        if 'error' in lower or 'timeout' in lower:
+            return None
+
+        if ':' in cleaned:
+            cleaned = cleaned.split(':', 1)[1].strip()
+        return cleaned
+
+    return None
+
+
+def parse_batch_output(output, count):
+    """Extract numbered paths from a batch response. Returns {index: path}."""
+    results = {}
+    for line in output.split('\n'):
+        match = BATCH_LINE_RE.match(line.replace('`', '').replace('**', ''))
+        if not match:
+            continue
+        index = int(match.group(1))
+        path = match.group(2).strip()
+        # Entries that are not a bare path are left out, so the caller asks
+        # about those paths one at a time instead of caching them
+        if 1 <= index <= count and VALID_PATH_RE.match(path):
+            results[index] = path
+    return results
+
+
+@functools.lru_cache(maxsize=None)
+def supports_system_prompt():
+    """Check once whether the installed claude CLI accepts --append-system-prompt."""
     try:
         result = subprocess.run(
-            ['claude', '--print', prompt],
+            ['claude', '--help'],
             capture_output=True,
             text=True,
             timeout=30,
             encoding='utf-8'
         )
+        return '--append-system-prompt' in result.stdout
+    except Exception:
+        return False
+
+
+def select_examples(prompt_path):
+    """Pick the indices of the MAX_EXAMPLES examples that best match the path's features."""
+    weights = {
+        name: weight for name, (weight, pattern) in EXAMPLE_FEATURES.items()
+        if pattern.search(prompt_path)
+    }
+    if not weights:
+        weights = {'simple': 1}
+
+    ranked = sorted(
+        range(len(V7_EXAMPLES)),
+        key=lambda i: (-sum(weights.get(tag, 0) for tag in V7_EXAMPLES[i][0]), i)
+    )
+    return tuple(sorted(ranked[:MAX_EXAMPLES]))
 
-        output = result.stdout.strip()
 
-        # Extract clean path from output
-        lines = [line.strip() for line in output.split('\n') if line.strip()]
+@functools.lru_cache(maxsize=None)
+def build_static_prompt(example_indices):
+    """Build the static prompt prefix from a subset of the examples."""
+    examples = '\n\n'.join(V7_EXAMPLES[i][1] for i in example_indices)
+    return V7_PROMPT_HEADER + examples + V7_PROMPT_RULES
 
-        # Find the line that looks like a path
-        for line in reversed(lines):
-            cleaned = line.replace('`', '').replace('**', '').strip()
 
-            # Skip error messages
-            if 'error' in cleaned.lower() or 'timeout' in cleaned.lower():
-                continue
-
-            if 'books/' in cleaned.lower() and '.mp3' in cleaned.lower():
-                # Remove any prefix like "Shortened:" or similar
-                if ':' in cleaned:
-                    cleaned = cleaned.split(':', 1)[1].strip()
-                return cleaned
+def run_claude(prompt, label, system_prompt=None):
+    """
+    Run the Claude CLI on a prompt. Returns stdout, or None on failure.
 
-        # Fallback to last line
-        if lines:
-            cleaned = lines[-1].replace('`', '').replace('**', '').strip()
+    system_prompt is passed separately so the provider can cache it across
+    calls; older CLIs without --append-system-prompt get it prepended instead.
+    """
+    if system_prompt and not supports_system_prompt():
+        prompt = system_prompt + prompt
+        system_prompt = None
 
-            # Don't return error messages
-            if 'error' in cleaned.lower() or 'timeout' in cleaned.lower():
-                return None
+    try:
+        if SESSIONS.enabled:
+            return SESSIONS.ask(prompt, timeout=30, system_prompt=system_prompt)
 
-            if ':' in cleaned:
-                cleaned = cleaned.split(':', 1)[1].strip()
-            return cleaned
+        cmd = ['claude', '--print']
+        if system_prompt:
+            cmd += ['--append-system-prompt', system_prompt]
+        cmd.append(prompt)
 
-        return None
+        # Python's own descriptors are non-inheritable, so skipping the
+        # close-all-fds step is safe and lets the child spawn faster
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=30,
+            encoding='utf-8',
+            close_fds=False
+        )
+        return result.stdout
 
     except subprocess.TimeoutExpired:
-        print(f"  ERROR: Timeout processing {original_path}")
+        print(f"  ERROR: Timeout processing {label}")
         return None
     except Exception as e:
         print(f"  ERROR: {e}")
         return None
 
 
+def get_prompt_path(original_path, base_dir):
+    """Format a file path the way the prompt examples are written."""
+    # Get path relative to base_dir for the prompt
+    try:
+        rel_path = Path(original_path).relative_to(Path(base_dir).parent)
+    except ValueError:
+        # If not relative, use as-is
+        rel_path = original_path
+
+    # Format path with backslashes for consistency with examples
+    return str(rel_path).translate(TO_BACKSLASHES)
+
+
+def get_shortened_path(original_path, base_dir):
+    """Use Claude CLI to get shortened path for a file."""
+    prompt_path = get_prompt_path(original_path, base_dir)
+
+    # Clean paths are handled by the local rules without calling Claude
+    shortened = try_rule_based_shorten(prompt_path)
+    if shortened:
+        return shortened
+
+    cache_key = LLMCache.make_key(PROMPT_VERSION, prompt_path)
+    cached = CACHE.get(cache_key)
+    if cached:
+        return cached
+
+    # Only the most relevant examples are sent; each subset is a stable
+    # prefix, so provider prompt caching still applies per subset
+    system_prompt = build_static_prompt(select_examples(prompt_path))
+    prompt = _PATH_PREFIX + prompt_path + _PATH_SUFFIX
+    output = run_claude(prompt, original_path, system_prompt=system_prompt)
+    if output is None:
+        return None
+
+    shortened = parse_claude_output(output)
+    if not shortened or not VALID_PATH_RE.match(shortened):
+        shortened = _retry_with_constraint(prompt + STRICT_SUFFIX, original_path, system_prompt)
+
+    if shortened:
+        CACHE.set(cache_key, shortened)
+    return shortened
+
+
+def _retry_with_constraint(prompt, label, system_prompt):
+    """Ask once more with the output format spelled out. Returns None if still invalid."""
+    output = run_claude(prompt, label, system_prompt=system_prompt)
+    if output is None:
+        return None
+
+    shortened = parse_claude_output(output)
+    if shortened and VALID_PATH_RE.match(shortened):
+        return shortened
+
+    print(f"  ERROR: Unexpected response for {label}")
+    return None
+
+
+def get_shortened_paths_batch(file_paths, base_dir, batch_size=BATCH_SIZE):
+    """
+    Shorten several paths with one Claude call per batch_size paths.
+
+    Returns {file_path: shortened_path or None}. Paths resolved by the local
+    rules or the cache are not sent,
+    and any path missing from a batch response is retried on its own.
+    """
+    results = {}
+    pending = []
+    for file_path in file_paths:
+        prompt_path = get_prompt_path(file_path, base_dir)
+        shortened = try_rule_based_shorten(prompt_path) or CACHE.get(
+            LLMCache.make_key(PROMPT_VERSION, prompt_path)
+        )
+        if shortened:
+            results[file_path] = shortened
+        else:
+            pending.append((file_path, prompt_path))
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        if len(batch) == 1:
+            results[batch[0][0]] = get_shortened_path(batch[0][0], base_dir)
+            continue
+
+        numbered = '\n'.join(f"{i}. {prompt_path}" for i, (_, prompt_path) in enumerate(batch, 1))
+        output = run_claude(_BATCH_PREFIX + numbered + _BATCH_SUFFIX,
+                            f"batch of {len(batch)} paths", system_prompt=V7_PROMPT_STATIC)
+        parsed = parse_batch_output(output, len(batch)) if output else {}
+
+        for i, (file_path, prompt_path) in enumerate(batch, 1):
+            if i in parsed:
+                results[file_path] = parsed[i]
+                CACHE.set(LLMCache.make_key(PROMPT_VERSION, prompt_path), parsed[i])
+            else:
+                results[file_path] = get_shortened_path(file_path, base_dir)
+
+    return results
+
+
+def synthesize_directory_files(files, rep_shortened):
+    """
+    Derive shortened paths for all files in one directory from Claude's answer
+    for the first file. Returns a list of (file_path, shortened), or None.
+
+    Returns None when a track number is ambiguous, when names would collide,
+    or when the local name disagrees with Claude's answer for the
+    representative file, so the caller can ask Claude about each file.
+    """
+    if not rep_shortened:
+        return None
+    normalized = rep_shortened.translate(TO_FORWARD_SLASHES)
+    if '/' not in normalized:
+        return None
+    short_dir = normalized.rsplit('/', 1)[0]
+
+    representative = files[0]
+    parent_name = representative.parent.name
+    local_names = [extract_track_number(fp.name, parent_name) for fp in files]
+
+    if None in local_names or len(set(local_names)) != len(local_names):
+        return None
+    if normalized != f"{short_dir}/{local_names[0]}{representative.suffix}":
+        return None
+
+    return [
+        (fp, f"{short_dir}/{name}{fp.suffix}")
+        for fp, name in zip(files, local_names)
+    ]
+
+
+def shorten_directories(dir_groups, base_dir, batch_size=BATCH_SIZE):
+    """
+    Shorten the files of several directories. Returns a list of (file_path, shortened).
+
+    Claude is asked about one representative file per directory (batched);
+    the directory portion of its answer is reused for the other files.
+    """
+    rep_results = get_shortened_paths_batch([files[0] for files in dir_groups], base_dir, batch_size)
+
+    results = []
+    fallback = []
+    for files in dir_groups:
+        rep_shortened = rep_results[files[0]]
+        local = synthesize_directory_files(files, rep_shortened)
+        if local is None:
+            results.append((files[0], rep_shortened))
+            fallback.extend(files[1:])
+        else:
+            results.extend(local)
+
+    if fallback:
+        results.extend(get_shortened_paths_batch(fallback, base_dir, batch_size).items())
+
+    return results
+
+
 def find_audiobook_files(base_dir):
-    """Find all audiobook files in the directory."""
-    return sorted(Path(base_dir).rglob("*.mp3"))
+    """
+    Yield audiobook files as they are found.
+
+    Files are yielded one directory at a time (sorted within each directory),
+    so callers can start working before the whole tree has been walked.
+    """
+    # os.scandir exposes the entry type from the directory listing itself,
+    # so no extra stat call is needed per entry (unlike Path.rglob)
+    pending = [os.fspath(base_dir)]
+    while pending:
+        directory = pending.pop()
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.lower().endswith('.mp3') and entry.is_file():
+                        files.append(entry.path)
+        except OSError as e:
+            # Skip unreadable folders (as Path.rglob did) instead of
+            # failing the whole walk
+            print(f"  [WARNING] Skipping unreadable folder {directory}: {e}\n")
+            continue
+
+        for path in sorted(files):
+            yield Path(path)
+        # Reversed so the stack pops subdirectories in sorted order
+        pending.extend(sorted(subdirs, reverse=True))
+
 
+def iter_directory_batches(files, batch_size):
+    """Group a directory-ordered stream of files into batches of per-directory lists."""
+    batch = []
+    for _, dir_files in itertools.groupby(files, key=lambda file_path: file_path.parent):
+        batch.append(list(dir_files))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
-def preview_changes(base_dir, limit=None):
+
+def preview_changes(base_dir, limit=None, max_workers=16, batch_size=BATCH_SIZE):
     """Preview what changes would be made without actually renaming."""
     files = find_audiobook_files(base_dir)
 
     if limit:
-        files = files[:limit]
+        files = itertools.islice(files, limit)
 
-    print(f"Found {len(files)} audiobook files to process")
+    print("Processing audiobook files as they are found")
     print(f"{'='*100}\n")
 
     changes = []
     errors = []
     skipped = []
+    processed = 0
+    base_parent = Path(base_dir).parent
 
-    for i, file_path in enumerate(files, 1):
-        rel_path = file_path.relative_to(Path(base_dir).parent)
-        print(f"[{i}/{len(files)}] Processing: {rel_path}")
+    # Pipeline: a producer thread walks the tree and queues batches of
+    # directories while the workers are already shortening earlier batches
+    num_workers = max(1, max_workers)
+    work = queue.Queue(maxsize=64)
+    results = queue.Queue()
+    walk_errors = []
 
-        shortened = get_shortened_path(file_path, base_dir)
+    def produce():
+        try:
+            for dir_batch in iter_directory_batches(files, batch_size):
+                work.put(dir_batch)
+        except Exception as e:
+            walk_errors.append(e)
+        finally:
+            for _ in range(num_workers):
+                work.put(None)
 
-        if not shortened:
-            errors.append(str(rel_path))
-            print(f"  [ERROR] Could not generate shortened path\n")
-            continue
+    def consume():
+        try:
+            while True:
+                dir_batch = work.get()
+                if dir_batch is None:
+                    break
+                try:
+                    results.put(shorten_directories(dir_batch, base_dir, batch_size))
+                except Exception as e:
+                    print(f"  ERROR: {e}")
+                    results.put([(fp, None) for dir_files in dir_batch for fp in dir_files])
+        finally:
+            results.put(None)
+
+    threading.Thread(target=produce, daemon=True).start()
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        for _ in range(num_workers):
+            executor.submit(consume)
+
+        finished = 0
+        while finished < num_workers:
+            batch_results = results.get()
+            if batch_results is None:
+                finished += 1
+                continue
 
-        # Normalize paths for comparison
-        original_normalized = str(rel_path).replace('\\', '/')
-        shortened_normalized = shortened.replace('\\', '/')
+            for file_path, shortened in batch_results:
+                rel_path = file_path.relative_to(base_parent)
 
-        if original_normalized == shortened_normalized:
-            skipped.append(str(rel_path))
-            print(f"  [SKIP] Already optimal\n")
-            continue
+                # The total is only known once the walk has finished
+                processed += 1
+                print(f"[{processed}/?] Processing: {rel_path}")
+
+                if not shortened:
+                    errors.append(str(rel_path))
+                    print(f"  [ERROR] Could not generate shortened path\n")
+                    continue
+
+                # Normalize paths for comparison
+                original_normalized = os.fspath(rel_path).translate(TO_FORWARD_SLASHES)
+                shortened_normalized = shortened.translate(TO_FORWARD_SLASHES)
+
+                if original_normalized == shortened_normalized:
+                    skipped.append(str(rel_path))
+                    print(f"  [SKIP] Already optimal\n")
+                    continue
+
+                new_path = base_parent / shortened
+
+                changes.append({
+                    'original': file_path,
+                    'new': new_path,
+                    'original_rel': str(rel_path),
+                    'new_rel': shortened
+                })
 
-        new_path = Path(base_dir).parent / shortened
+                print(f"  [OK] FROM: {rel_path}")
+                print(f"       TO:   {shortened}\n")
 
-        changes.append({
-            'original': file_path,
-            'new': new_path,
-            'original_rel': str(rel_path),
-            'new_rel': shortened
-        })
+    if walk_errors:
+        raise walk_errors[0]
 
-        print(f"  [OK] FROM: {rel_path}")
-        print(f"       TO:   {shortened}\n")
+    # Results arrive in completion order; restore a stable order for applying
+    changes.sort(key=lambda change: change['original'])
 
     # Summary
     print(f"\n{'='*100}")
     print("SUMMARY")
     print(f"{'='*100}")
-    print(f"Total files:      {len(files)}")
+    print(f"Total files:      {processed}")
     print(f"To be renamed:    {len(changes)}")
     print(f"Already optimal:  {len(skipped)}")
     print(f"Errors:           {len(errors)}")
 
     if errors:
         print(f"\nFiles with errors:")
-        for error in errors:
+        for error in sorted(errors):
             print(f"  - {error}")
 
     return changes
 
 
+def rename_file(change):
+    """Move one file. Returns None on success, or a warning/error message."""
+    try:
+        # Check if target already exists
+        if change['new'].exists():
+            return "[WARNING] Target exists, skipping"
+
+        # Move the file; a plain rename is a single syscall when both
+        # paths are on the same filesystem, which is the normal case
+        try:
+            os.rename(change['original'], change['new'])
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(str(change['original']), str(change['new']))
+        return None
+
+    except Exception as e:
+        return f"[ERROR] {e}"
+
+
 def apply_changes(changes, base_dir):
     """Actually perform the file renames."""
     print(f"\n{'='*100}")
@@ -205,32 +625,50 @@ def apply_changes(changes, base_dir):
     for change in changes:
         dirs_to_create.add(change['new'].parent)
 
-    # Create all needed directories
+    # Create all needed directories, shallowest first, so a directory's
+    # parent usually exists already and ancestors are not re-walked
     print(f"Creating {len(dirs_to_create)} directories...")
-    for dir_path in sorted(dirs_to_create):
-        dir_path.mkdir(parents=True, exist_ok=True)
+    for dir_path in sorted(dirs_to_create, key=lambda p: (len(p.parts), p)):
+        try:
+            dir_path.mkdir(exist_ok=True)
+        except FileNotFoundError:
+            dir_path.mkdir(parents=True, exist_ok=True)
 
     print(f"\nRenaming {len(changes)} files...\n")
 
-    for i, change in enumerate(changes, 1):
-        try:
+    # Renames are syscall-bound, so run them in parallel. Each target is
+    # claimed by only one change, so two workers can never race for it.
+    claimed_targets = set()
+    duplicates = []
+    to_rename = []
+    for change in changes:
+        if change['new'] in claimed_targets:
+            duplicates.append(change)
+        else:
+            claimed_targets.add(change['new'])
+            to_rename.append(change)
+
+    for i, change in enumerate(duplicates, 1):
+        print(f"[{i}/{len(changes)}] {change['original_rel']}")
+        print(f"          → {change['new_rel']}")
+        print(f"  [WARNING] Another file is already being renamed to this target, skipping\n")
+        failed += 1
+
+    with ThreadPoolExecutor(max_workers=RENAME_WORKERS) as executor:
+        future_to_change = {executor.submit(rename_file, change): change for change in to_rename}
+
+        for i, future in enumerate(as_completed(future_to_change), len(duplicates) + 1):
+            change = future_to_change[future]
             print(f"[{i}/{len(changes)}] {change['original_rel']}")
             print(f"          → {change['new_rel']}")
 
-            # Check if target already exists
-            if change['new'].exists():
-                print(f"  [WARNING] Target exists, skipping")
+            problem = future.result()
+            if problem:
+                print(f"  {problem}\n")
                 failed += 1
-                continue
-
-            # Move the file
-            shutil.move(str(change['original']), str(change['new']))
-            print(f"  [SUCCESS]\n")
-            success += 1
-
-        except Exception as e:
-            print(f"  [ERROR] {e}\n")
-            failed += 1
+            else:
+                print(f"  [SUCCESS]\n")
+                success += 1
 
     # Cleanup empty directories
     print(f"\nCleaning up empty directories...")
@@ -243,16 +681,20 @@ def apply_changes(changes, base_dir):
 
 def cleanup_empty_dirs(base_dir):
     """Remove empty directories after moving files."""
-    # Walk from bottom up to remove nested empty dirs
+    # Walk from bottom up; a directory is empty when it has no files and
+    # every subdirectory was already removed, so no directory is reopened
+    base_dir = os.fspath(base_dir)
+    removed = set()
     for root, dirs, files in os.walk(base_dir, topdown=False):
-        for dir_name in dirs:
-            dir_path = Path(root) / dir_name
+        if root == base_dir or files:
+            continue
+        if all(os.path.join(root, dir_name) in removed for dir_name in dirs):
             try:
-                if not any(dir_path.iterdir()):  # Check if empty
-                    dir_path.rmdir()
-                    print(f"  Removed: {dir_path.relative_to(Path(base_dir).parent)}")
+                os.rmdir(root)
             except OSError:
-                pass  # Directory not empty or other error
+                continue  # Directory not empty or other error
+            removed.add(root)
+            print(f"  Removed: {Path(root).relative_to(Path(base_dir).parent)}")
 
 
 def main():
@@ -277,9 +719,22 @@ Examples:
                        help='Only process first N files')
     parser.add_argument('--dir', type=str, default='VOLVO/books',
                        help='Directory to process (default: VOLVO/books)')
+    parser.add_argument('--workers', type=int, default=16, metavar='N',
+                       help='Parallel Claude CLI calls (default: 16)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, metavar='N',
+                       help=f'Paths sent to Claude per call (default: {BATCH_SIZE})')
+    parser.add_argument('--persistent', action='store_true',
+                       help='Reuse long-lived claude processes instead of one process per call')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore cached Claude responses and always query Claude')
 
     args = parser.parse_args()
 
+    if args.no_cache:
+        CACHE.enabled = False
+    if args.persistent:
+        SESSIONS.enabled = True
+
     # Determine base directory
     script_dir = Path(__file__).parent
     base_dir = script_dir / args.dir
@@ -295,7 +750,11 @@ Examples:
     print()
 
     # Preview changes
-    changes = preview_changes(base_dir, limit=args.limit)
+    try:
+        changes = preview_changes(base_dir, limit=args.limit, max_workers=args.workers,
+                                  batch_size=args.batch_size)
+    finally:
+        SESSIONS.close()
 
     if not changes:
         print("\nNo changes to apply.")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Rule-based audiobook path shortening.
+
+Implements the mechanical rules from the V7 prompt as compiled regexes so
+that clean paths can be shortened without calling Claude. Anything the rules
+cannot handle confidently returns None and is left to Claude.
+"""
+
+import re
+from pathlib import Path
+
+# Track numbers in filenames
+DISC_TRACK_RE = re.compile(r'^0*(\d+)-(\d+)\b')
+PART_RE = re.compile(r'\b(?:Part|Disc|Disk|CD)\s*0*(\d+)', re.IGNORECASE)
+OF_RE = re.compile(r'\b(\d+)\s+of\s+\d+\b', re.IGNORECASE)
+NUMBER_RE = re.compile(r'\d+')
+
+# Directory name cleanup
+YEAR_PREFIX_RE = re.compile(r'^\((\d{4})\)\s*')
+PAREN_RE = re.compile(r'\s*\([^)]*\)')
+PART_GROUP_RE = re.compile(r'\s*[(\[]?\b(?:Part|Disc|Disk|CD)\s*\d+[)\]]?', re.IGNORECASE)
+BRACKET_RE = re.compile(r'\s*\[[^\]]*\]')
+SERIES_NUMBER_RE = re.compile(r'#\d+')
+DROP_RE = re.compile(r'\b(?:Audio\s?books?|Collection)\b', re.IGNORECASE)
+AND_RE = re.compile(r'\s+and(?:\s+the)?\s+', re.IGNORECASE)
+LEADING_THE_RE = re.compile(r'^The\s+')
+SEPARATOR_RE = re.compile(r'^[\s\-]+|[\s\-]+$')
+SPACES_RE = re.compile(r'\s{2,}')
+MINOR_WORDS = {'Of', 'The', 'A', 'An', 'In', 'On', 'At', 'To', 'For'}
+
+# Leftovers that mean the rules did not fully understand a directory name
+AMBIGUOUS_RE = re.compile(r'[()\[\]#]|\s-\s')
+YEAR_TITLE_RE = re.compile(r'^\d{4} - ')
+
+
+def extract_track_number(filename, parent_name=''):
+    """
+    Build the shortened filename stem ("01", "001", "3-10") from a filename.
+
+    Returns None when the track number is ambiguous, so the caller can fall
+    back to asking Claude about the full path.
+    """
+    stem = Path(filename).stem
+
+    # Already in disc-track form, e.g. "1-01 Ch 1a, An Unexpected Party"
+    match = DISC_TRACK_RE.match(stem)
+    if match:
+        return f"{int(match.group(1))}-{match.group(2)}"
+
+    # "Part N" / "Disc N" in the filename, else in the parent directory name
+    part = None
+    match = PART_RE.search(stem)
+    if match:
+        part = match.group(1)
+        stem = stem[:match.start()] + stem[match.end():]
+    else:
+        match = PART_RE.search(parent_name)
+        if match:
+            part = match.group(1)
+
+    match = OF_RE.search(stem)
+    if match:
+        track = match.group(1)
+    else:
+        numbers = NUMBER_RE.findall(stem)
+        if len(numbers) != 1:
+            return None
+        track = numbers[0]
+
+    track = track.zfill(2)
+    return f"{part}-{track}" if part else track
+
+
+def _strip_ancestors(name, ancestors):
+    """Remove or abbreviate ancestor names repeated at the start of a directory name."""
+    changed = True
+    while changed:
+        changed = False
+        for ancestor in ancestors:
+            if not ancestor or not name.startswith(ancestor):
+                continue
+            rest = name[len(ancestor):]
+            if rest.startswith('-') or rest.startswith(' -'):
+                # "Roald Dahl - Charlie..." -> "Charlie..."
+                name = SEPARATOR_RE.sub('', rest)
+                changed = True
+            elif rest.startswith(' ') and ' ' in ancestor:
+                # "Harry Potter And The..." -> "HP And The..."
+                name = ''.join(word[0] for word in ancestor.split()) + rest
+                changed = True
+    return name
+
+
+def _clean_dir_name(name, ancestors):
+    """Apply the prompt rules to one directory name. Returns '' if redundant."""
+    year = None
+    match = YEAR_PREFIX_RE.match(name)
+    if match:
+        year = match.group(1)
+        name = name[match.end():]
+
+    name = PART_GROUP_RE.sub('', name)
+    name = PAREN_RE.sub('', name)
+    name = BRACKET_RE.sub('', name)
+    name = SERIES_NUMBER_RE.sub('', name)
+    name = DROP_RE.sub('', name)
+    name = SPACES_RE.sub(' ', SEPARATOR_RE.sub('', name))
+
+    if name in ancestors:
+        return ''
+
+    name = _strip_ancestors(name, ancestors)
+    name = AND_RE.sub(' & ', name)
+
+    words = name.split(' ')
+    name = ' '.join(words[:1] + [w.lower() if w in MINOR_WORDS else w for w in words[1:]])
+
+    return f"{year} - {name}" if year else name
+
+
+def try_rule_based_shorten(prompt_path):
+    """
+    Shorten an audiobook path using the prompt rules only.
+
+    prompt_path is relative to the books directory's parent and may use
+    either slash style. Returns the shortened path with forward slashes, or
+    None when the path is ambiguous and should be sent to Claude.
+    """
+    parts = [part for part in re.split(r'[\\/]', prompt_path) if part]
+    if len(parts) < 3:
+        return None
+
+    root, dirs, filename = parts[0], parts[1:-1], parts[-1]
+
+    track = extract_track_number(filename, dirs[-1])
+    if track is None:
+        return None
+
+    cleaned = []
+    ancestors = []
+    for name in dirs:
+        short = _clean_dir_name(name, ancestors)
+        if short:
+            check = YEAR_TITLE_RE.sub('', short)
+            if AMBIGUOUS_RE.search(check) or not check:
+                return None
+            # Ancestors are matched before the leading "The" is dropped
+            ancestors.append(short)
+            cleaned.append(LEADING_THE_RE.sub('', short))
+
+    if not cleaned:
+        return None
+
+    return '/'.join([root] + cleaned + [track + Path(filename).suffix])
@@ -292,6 +292,30 @@ def test_prompt(prompt_name, prompt_template, test_case):
         return None, False
 
 
+def run_rule_tests():
+    """Check the local rule engine against the test cases (no Claude calls)."""
+    from rules import try_rule_based_shorten
+
+    matches = 0
+    deferred = 0
+    for test_case in TEST_CASES:
+        got = try_rule_based_shorten(test_case["input"])
+        if got is None:
+            deferred += 1
+            status = "DEFER"
+        elif got == test_case["expected"]:
+            matches += 1
+            status = "YES"
+        else:
+            status = "NO"
+        print(f"{status:5} {test_case['input']}")
+        print(f"      Expected: {test_case['expected']}")
+        print(f"      Got:      {got}")
+
+    print(f"\nRules: {matches}/{len(TEST_CASES)} matched, {deferred} deferred to Claude, "
+          f"{len(TEST_CASES) - matches - deferred} wrong")
+
+
 def run_all_tests():
     """Run all prompts against all test cases."""
     results = {}
@@ -350,11 +374,13 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         # Test specific prompt
         prompt_name = sys.argv[1]
-        if prompt_name in PROMPTS:
+        if prompt_name == "rules":
+            run_rule_tests()
+        elif prompt_name in PROMPTS:
             for test_case in TEST_CASES:
                 test_prompt(prompt_name, PROMPTS[prompt_name], test_case)
         else:
             print(f"Unknown prompt: {prompt_name}")
-            print(f"Available: {', '.join(PROMPTS.keys())}")
+            print(f"Available: rules, {', '.join(PROMPTS.keys())}")
     else:
         run_all_tests()
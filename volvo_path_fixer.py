@@ -18,11 +18,10 @@ WARNING: This script renames files. Always backup your files first!
 import os
 import sys
 import csv
-import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Set
-from collections import defaultdict
+from collections import Counter, defaultdict
 import re
 
 # Fix Windows console encoding issues
@@ -34,6 +33,14 @@ if sys.platform == "win32":
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
 
+# Read buffer for CSV reports (the default 8 KiB means many small reads)
+CSV_READ_BUFFER = 1024 * 1024
+
+# Log file write buffer, and console lines collected per stdout write
+LOG_BUFFER = 1024 * 1024
+CONSOLE_FLUSH_LINES = 200
+
+
 class VolvoPathFixer:
     """Fixes filename and character issues based on CSV report from volvo_usb_verifier.py"""
 
@@ -53,6 +60,9 @@ class VolvoPathFixer:
         'ÿ': 'y'
     }
 
+    # Single-pass translation table for CHAR_REPLACEMENTS (all keys are one character)
+    CHAR_TABLE = str.maketrans(CHAR_REPLACEMENTS)
+
     # Common abbreviations for shortening
     WORD_REPLACEMENTS = {
         'The ': '',
@@ -74,40 +84,86 @@ class VolvoPathFixer:
         'Unreleased': 'Unrel',
     }
 
+    # All WORD_REPLACEMENTS keys as one alternation (longest first, so longer keys win)
+    WORD_RE = re.compile('|'.join(
+        re.escape(word) for word in sorted(WORD_REPLACEMENTS, key=len, reverse=True)
+    ))
+
+    # Leading track number kept when truncating a filename
+    TRACK_RE = re.compile(r'^(\d+[\s\-.]*)')
+
+    # Issue types read from the CSV report
+    HANDLED_ISSUE_TYPES = frozenset({'Filename Length', 'Invalid Characters', 'Path Length'})
+
     MAX_PATH_LENGTH = 60
     MAX_FILENAME_LENGTH = 64
 
-    def __init__(self, csv_file: str, drive_path: str, dry_run: bool = True):
+    def __init__(self, csv_file: str, drive_path: str, dry_run: bool = True, log_file: Optional[str] = None):
         self.csv_file = Path(csv_file)
         self.drive_path = Path(drive_path)
+        # Per-file paths are built as strings; Path objects are much slower to construct
+        self._drive_path_str = str(self.drive_path)
         self.dry_run = dry_run
-        self.logger = logging.getLogger('VolvoPathFixer')
+        # Output is buffered: a dry run can print tens of thousands of lines
+        self._log_fh = open(log_file, 'a', encoding='utf-8', buffering=LOG_BUFFER) if log_file else None
+        self._console_lines = []
 
         # Statistics
         self.stats = defaultdict(int)
         self.fixed_files = []
         self.failed_files = []
         self.renamed_dirs = {}  # Track directory renames {old_path: new_path}
+        self._ensured_dirs = set()  # Target directories already created
         self.paths_too_long = []  # Paths that exceed 60 chars (for reporting only)
 
     def log(self, message: str):
-        """Log message to both console and file."""
-        print(message)
-        self.logger.info(message)
-
-    def load_issues(self) -> Dict[str, List[Dict]]:
-        """Load issues from CSV file, grouped by file path."""
+        """Log message to both console and file (buffered; see flush_log)."""
+        if self._log_fh:
+            self._log_fh.write(message + '\n')
+        self._console_lines.append(message)
+        if len(self._console_lines) >= CONSOLE_FLUSH_LINES:
+            self.flush_log()
+
+    def flush_log(self):
+        """Write buffered console output and flush the log file."""
+        if self._console_lines:
+            sys.stdout.write('\n'.join(self._console_lines) + '\n')
+            self._console_lines.clear()
+        sys.stdout.flush()
+        if self._log_fh:
+            self._log_fh.flush()
+
+    def close(self):
+        """Flush all output and close the log file."""
+        self.flush_log()
+        if self._log_fh:
+            self._log_fh.close()
+            self._log_fh = None
+
+    def load_issues(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Load issues from CSV file as (issue_type, description), grouped by file path."""
         issues_by_file = defaultdict(list)
 
         try:
-            with open(self.csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+            with open(self.csv_file, 'r', encoding='utf-8', newline='', buffering=CSV_READ_BUFFER) as f:
+                reader = csv.reader(f)
+                header = next(reader)
+                path_idx = header.index('file_path')
+                type_idx = header.index('issue_type')
+                desc_idx = header.index('description')
+                min_width = max(path_idx, type_idx, desc_idx) + 1
                 for row in reader:
+                    # Blank lines and rows cut short (e.g. by an interrupted
+                    # verifier run) have no issue to read
+                    if len(row) < min_width:
+                        if row:
+                            self.log(f"⚠ Skipping incomplete CSV row {reader.line_num}: {','.join(row)}")
+                        continue
+
                     # Process filename, character, and path length issues
                     # (we fix filename/chars but only report path length)
-                    if row['issue_type'] in ('Filename Length', 'Invalid Characters', 'Path Length'):
-                        file_path = row['file_path']
-                        issues_by_file[file_path].append(row)
+                    if row[type_idx] in self.HANDLED_ISSUE_TYPES:
+                        issues_by_file[row[path_idx]].append((row[type_idx], row[desc_idx]))
 
             self.log(f"Loaded issues for {len(issues_by_file)} files from {self.csv_file}")
             return issues_by_file
@@ -131,13 +187,12 @@ class VolvoPathFixer:
         issues_by_file = self.load_issues()
 
         # Group by issue type for statistics
-        issue_types = defaultdict(int)
-        for issues in issues_by_file.values():
-            for issue in issues:
-                issue_types[issue['issue_type']] += 1
+        issue_types = Counter(
+            issue_type for issues in issues_by_file.values() for issue_type, _ in issues
+        )
 
         self.log(f"\nIssue breakdown:")
-        for issue_type, count in sorted(issue_types.items(), key=lambda x: -x[1]):
+        for issue_type, count in issue_types.most_common():
             self.log(f"  {issue_type}: {count}")
 
         # Process files
@@ -153,44 +208,44 @@ class VolvoPathFixer:
         # Print summary
         self.print_summary()
 
-    def _process_file(self, file_path: str, issues: List[Dict]):
+    def _process_file(self, file_path: str, issues: List[Tuple[str, str]]):
         """Process a single file - fix what we can, report what we can't."""
-        full_path = self.drive_path / file_path
-
-        if not full_path.exists():
-            self.failed_files.append((file_path, "File not found"))
-            return
+        full_path = os.path.join(self._drive_path_str, file_path)
 
         # Determine what issues exist
-        has_long_path = any(i['issue_type'] == 'Path Length' for i in issues)
-        has_long_filename = any(i['issue_type'] == 'Filename Length' for i in issues)
-        has_invalid_chars = any(i['issue_type'] == 'Invalid Characters' for i in issues)
+        issue_types = {issue_type for issue_type, _ in issues}
+        has_long_path = 'Path Length' in issue_types
+        has_long_filename = 'Filename Length' in issue_types
+        has_invalid_chars = 'Invalid Characters' in issue_types
 
         fixes_applied = []
-        new_path = Path(file_path)
+        new_path = file_path
 
         # Fix invalid characters first
         if has_invalid_chars:
-            new_path = Path(self._fix_invalid_chars(str(new_path)))
+            new_path = self._fix_invalid_chars(new_path)
             fixes_applied.append("Replaced invalid characters")
             self.stats['invalid_chars_fixed'] += 1
 
         # Fix long filename
         if has_long_filename:
-            new_filename = self._shorten_filename(new_path.name)
-            new_path = new_path.parent / new_filename
+            parent, filename = os.path.split(new_path)
+            new_filename = self._shorten_filename(filename)
+            new_path = os.path.join(parent, new_filename)
             fixes_applied.append(f"Shortened filename to {len(new_filename)} chars")
             self.stats['filenames_shortened'] += 1
 
+        new_path_len = len(new_path)
+
         # Check if path is too long (for reporting only, don't try to fix)
-        if len(str(new_path)) > self.MAX_PATH_LENGTH:
-            self.paths_too_long.append((file_path, str(new_path), len(str(new_path))))
-            fixes_applied.append(f"⚠ WARNING: Path is {len(str(new_path))} chars (exceeds 60 limit)")
+        if new_path_len > self.MAX_PATH_LENGTH:
+            self.paths_too_long.append((file_path, new_path, new_path_len))
+            fixes_applied.append(f"⚠ WARNING: Path is {new_path_len} chars (exceeds 60 limit)")
 
         # Report on this file if there are any issues
         if fixes_applied:
             # Something to report (fixes or warnings)
-            if str(new_path) != file_path:
+            if new_path != file_path:
                 # File will be renamed
                 if self.dry_run:
                     self.log(f"Would rename:")
@@ -198,17 +253,24 @@ class VolvoPathFixer:
                     self.log(f"  TO:   {new_path}")
                     for fix in fixes_applied:
                         self.log(f"    - {fix}")
-                    self.fixed_files.append((file_path, str(new_path)))
+                    self.fixed_files.append((file_path, new_path))
                 else:
-                    # Perform actual rename
+                    # Perform actual rename (dry runs skip the existence check)
+                    if not os.path.exists(full_path):
+                        self.failed_files.append((file_path, "File not found"))
+                        return
                     try:
-                        new_full_path = self.drive_path / new_path
-                        new_full_path.parent.mkdir(parents=True, exist_ok=True)
-                        full_path.rename(new_full_path)
+                        new_full_path = os.path.join(self._drive_path_str, new_path)
+                        new_parent = os.path.dirname(new_full_path)
+                        # Usually the file stays in its own (existing) directory
+                        if new_parent != os.path.dirname(full_path) and new_parent not in self._ensured_dirs:
+                            os.makedirs(new_parent, exist_ok=True)
+                            self._ensured_dirs.add(new_parent)
+                        os.rename(full_path, new_full_path)
                         self.log(f"✓ Renamed: {file_path} -> {new_path}")
                         for fix in fixes_applied:
                             self.log(f"    - {fix}")
-                        self.fixed_files.append((file_path, str(new_path)))
+                        self.fixed_files.append((file_path, new_path))
                         self.stats['files_renamed'] += 1
                     except Exception as e:
                         self.log(f"✗ Failed to rename {file_path}: {e}")
@@ -223,29 +285,41 @@ class VolvoPathFixer:
 
     def _fix_invalid_chars(self, path_str: str) -> str:
         """Replace invalid characters with safe alternatives."""
-        result = path_str
-        for char, replacement in self.CHAR_REPLACEMENTS.items():
-            result = result.replace(char, replacement)
-        return result
+        # Every CHAR_REPLACEMENTS key is non-ASCII, so ASCII paths need no work
+        if path_str.isascii():
+            return path_str
+        return path_str.translate(self.CHAR_TABLE)
 
     def _shorten_filename(self, filename: str) -> str:
         """Shorten a filename to fit within MAX_FILENAME_LENGTH."""
-        if len(filename) <= self.MAX_FILENAME_LENGTH:
+        max_length = self.MAX_FILENAME_LENGTH
+        if len(filename) <= max_length:
             return filename
 
         # Separate name and extension
-        stem = Path(filename).stem
-        ext = Path(filename).suffix
+        stem, ext = os.path.splitext(filename)
+
+        # Apply word replacements in one pass, left to right, until the stem fits
+        max_stem_length = max_length - len(ext)
+        excess = len(stem) - max_stem_length
 
-        # Apply word replacements
-        for old, new in self.WORD_REPLACEMENTS.items():
-            stem = stem.replace(old, new)
+        def abbreviate(match):
+            nonlocal excess
+            word = match.group(0)
+            if excess <= 0:
+                return word
+            short = self.WORD_REPLACEMENTS[word]
+            excess -= len(word) - len(short)
+            return short
+
+        stem = self.WORD_RE.sub(abbreviate, stem)
+        if len(stem) <= max_stem_length:
+            return stem + ext
 
         # If still too long, truncate intelligently
-        max_stem_length = self.MAX_FILENAME_LENGTH - len(ext)
         if len(stem) > max_stem_length:
             # Try to keep track number at beginning
-            track_match = re.match(r'^(\d+[\s\-\.]*)', stem)
+            track_match = self.TRACK_RE.match(stem)
             if track_match:
                 track_num = track_match.group(1)
                 remaining_length = max_stem_length - len(track_num)
@@ -302,26 +376,17 @@ class VolvoPathFixer:
         else:
             self.log("✓ Fixes have been applied!")
         self.log(f"{'='*70}")
+        self.flush_log()
 
 
 def setup_logging() -> str:
-    """Set up logging to timestamped file."""
+    """Create the logs directory and return a timestamped log file path."""
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = log_dir / f"volvo_path_fixer_{timestamp}.log"
 
-    logger = logging.getLogger('VolvoPathFixer')
-    logger.setLevel(logging.INFO)
-
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter('%(message)s')
-    file_handler.setFormatter(file_formatter)
-
-    logger.addHandler(file_handler)
-
     return str(log_file)
 
 
@@ -369,8 +434,11 @@ WARNING: Always backup your files before running with --apply!
 
     # Run fixer
     dry_run = not args.apply
-    fixer = VolvoPathFixer(args.csv_file, args.drive_path, dry_run=dry_run)
-    fixer.fix_all()
+    fixer = VolvoPathFixer(args.csv_file, args.drive_path, dry_run=dry_run, log_file=log_file)
+    try:
+        fixer.fix_all()
+    finally:
+        fixer.close()
 
     print(f"\nLog file saved to: {log_file}")
 
@@ -19,12 +19,14 @@ import os
 import sys
 import csv
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from typing import Iterator, List, Tuple, Optional
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from itertools import groupby
+from operator import itemgetter
 
 # Fix Windows console encoding issues
 if sys.platform == "win32":
@@ -35,55 +37,261 @@ if sys.platform == "win32":
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
 try:
-    from mutagen.mp3 import MP3
     from mutagen.id3 import ID3, ID3NoHeaderError, TIT2, TPE1, TALB, TDRC, APIC
     from mutagen.id3 import Encoding
+    from mutagen.id3 import TextFrame, PairedTextFrame, USLT, SYLT, GEOB, COMR, OWNE, USER, WXXX
 except ImportError:
     print("ERROR: This script requires the 'mutagen' library.")
     print("Install it with: pip install mutagen")
     sys.exit(1)
 
 
+# Read buffer for CSV reports (the default 8 KiB means many small reads)
+CSV_READ_BUFFER = 1024 * 1024
+
+# Per-file output is written in batches: every LOG_FLUSH_FILES results, or
+# sooner if LOG_FLUSH_SECONDS have passed so progress stays visible
+LOG_FLUSH_FILES = 200
+LOG_FLUSH_SECONDS = 1.0
+
+# Files queued per worker process while the CSV is streamed in
+MAX_PENDING_PER_WORKER = 2
+
+
+# Every frame type with a text encoding (ID3v2.2 frames are upgraded to
+# these on load); an isinstance check is cheaper than hasattr per frame
+ENCODED_FRAME_TYPES = (TextFrame, PairedTextFrame, APIC, USLT, SYLT, GEOB, COMR, OWNE, USER, WXXX)
+
+
+def _convert_to_latin1(tags: ID3):
+    """Switch every frame that has a text encoding to LATIN1."""
+    for frame in tags.values():
+        if isinstance(frame, ENCODED_FRAME_TYPES):
+            frame.encoding = Encoding.LATIN1
+
+
+def process_file(drive_path: str, file_path: str, issues: List[Tuple[str, str]], dry_run: bool):
+    """
+    Process a single file in a worker process.
+
+    Returns (file_path, fixes_applied, success, stat_deltas, failure), where
+    failure is the error to report or None.
+    """
+    full_path = os.path.join(drive_path, file_path)
+
+    # A dry run only reports what would change, so it never touches the file
+    if not dry_run and not os.path.exists(full_path):
+        return (file_path, ["File not found"], False, {}, "File not found")
+
+    return fix_mp3_file(full_path, file_path, issues, dry_run)
+
+
+def fix_mp3_file(full_path: str, rel_path: str, issues: List[Tuple[str, str]], dry_run: bool):
+    """Fix issues in an MP3 file. Returns (file_path, fixes_applied, success, stat_deltas, failure)."""
+    # Plain dict of counts: cheap to pickle back to the main process
+    stats = {}
+    try:
+        # Issues are pre-filtered to ID3/artwork ones; descriptions are
+        # joined once so each check below is a single substring search
+        id3_descriptions = ' | '.join(description for _, description in issues)
+
+        # Load only the ID3 block (only needed when actually modifying it);
+        # none of the fixes need the MPEG frame info that MP3() would scan
+        tags = None
+        if not dry_run:
+            try:
+                tags = ID3(full_path)
+            except ID3NoHeaderError:
+                tags = None
+            except Exception as e:
+                return (rel_path, [f"Failed to load ID3 tags: {e}"], False, stats, f"Failed to load ID3 tags: {e}")
+
+        modified = False
+        fixes_applied = []
+
+        # Handle "No ID3 tags found"
+        if "No ID3 tags found" in id3_descriptions:
+            if dry_run:
+                fixes_applied.append("Would add basic ID3v2.3 tags")
+            else:
+                # Create new ID3v2.3 tags
+                tags = ID3()
+                # Add minimal tags (title from filename; every file here ends in .mp3)
+                title = os.path.basename(full_path)[:-4]
+                tags.add(TIT2(encoding=Encoding.LATIN1, text=title))
+                modified = True
+                fixes_applied.append("Added basic ID3v2.3 tags")
+            stats['added_tags'] = 1
+
+        # Handle ID3v2.4 -> ID3v2.3 conversion
+        elif "ID3v2.4" in id3_descriptions:
+            if dry_run:
+                fixes_applied.append("Would convert ID3v2.4 to ID3v2.3")
+            else:
+                if tags:
+                    _convert_to_latin1(tags)
+                    modified = True
+                    fixes_applied.append("Converted ID3v2.4 to ID3v2.3")
+            stats['converted_tags'] = 1
+
+        # Handle unusual ID3 versions (2.2, etc.)
+        elif "Unusual ID3 version" in id3_descriptions:
+            if dry_run:
+                fixes_applied.append("Would convert to ID3v2.3")
+            else:
+                if tags:
+                    _convert_to_latin1(tags)
+                    modified = True
+                    fixes_applied.append("Converted to ID3v2.3")
+            stats['converted_unusual_tags'] = 1
+
+        # Handle large album art
+        if "Large artwork" in id3_descriptions:
+            if dry_run:
+                fixes_applied.append("Would remove large album artwork")
+            else:
+                if tags:
+                    # Remove all APIC frames (album art)
+                    tags.delall('APIC')
+                    modified = True
+                    fixes_applied.append("Removed large album artwork")
+            stats['removed_artwork'] = 1
+
+        # Save changes
+        if modified:
+            try:
+                # Save with BOTH ID3v1 and ID3v2.3 for best compatibility
+                # According to Volvo specs: "Including both ID3v1 and ID3v2.3 tags
+                # provides the best fallback behavior"
+                tags.save(full_path, v1=2, v2_version=3)
+                stats['files_modified'] = 1
+                return (rel_path, fixes_applied, True, stats, None)
+            except Exception as e:
+                return (rel_path, fixes_applied + [f"Failed to save: {e}"], False, stats, f"Failed to save: {e}")
+        elif fixes_applied:
+            # Dry run - record what would be done
+            return (rel_path, fixes_applied, True, stats, None)
+
+        return (rel_path, [], True, stats, None)
+
+    except Exception as e:
+        return (rel_path, [f"Unexpected error: {e}"], False, stats, f"Unexpected error: {e}")
+
+
 class VolvoUSBFixer:
     """Fixes audio files based on CSV report from volvo_usb_verifier.py"""
 
-    def __init__(self, csv_file: str, drive_path: str, dry_run: bool = True, num_threads: Optional[int] = None):
+    def __init__(self, csv_file: str, drive_path: str, dry_run: bool = True, num_workers: Optional[int] = None):
         self.csv_file = Path(csv_file)
         self.drive_path = Path(drive_path)
         self.dry_run = dry_run
         self.logger = logging.getLogger('VolvoUSBFixer')
-        self.num_threads = num_threads or (os.cpu_count() or 4) * 2
-
-        # Statistics (thread-safe)
+        # Mutagen parsing is CPU-bound Python, so use one process per core
+        self.num_workers = num_workers or os.cpu_count() or 4
+        # (file_path, issue_type, description) column indexes and the number
+        # of columns in the CSV, set by read_csv_header
+        self.csv_columns = None
+        self.csv_width = 0
+
+        # Statistics (only updated by the main process)
         self.stats = defaultdict(int)
-        self.stats_lock = threading.Lock()
         self.fixed_files = []
-        self.fixed_files_lock = threading.Lock()
         self.failed_files = []
-        self.failed_files_lock = threading.Lock()
 
     def log(self, message: str):
         """Log message to both console and file."""
         print(message)
         self.logger.info(message)
 
-    def load_issues(self) -> Dict[str, List[Dict]]:
-        """Load issues from CSV file, grouped by file path."""
-        issues_by_file = defaultdict(list)
+    def log_lines(self, lines: List[str]):
+        """Log several messages with a single console write and log record."""
+        if lines:
+            self.log('\n'.join(lines))
 
+    def read_csv_header(self):
+        """Find the CSV columns the fixer needs. Exits if the file cannot be used."""
         try:
-            with open(self.csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    file_path = row['file_path']
-                    issues_by_file[file_path].append(row)
-
-            self.log(f"Loaded issues for {len(issues_by_file)} files from {self.csv_file}")
-            return issues_by_file
+            with open(self.csv_file, 'r', encoding='utf-8', newline='') as f:
+                header = next(csv.reader(f), None)
+            if header is None:
+                raise ValueError("file is empty")
+            self.csv_columns = (
+                header.index('file_path'),
+                header.index('issue_type'),
+                header.index('description'),
+            )
+            self.csv_width = len(header)
         except Exception as e:
             self.log(f"ERROR: Failed to load CSV file: {e}")
             sys.exit(1)
 
+    def iter_fixable_rows(self, warn: bool = True) -> Iterator[Tuple[str, str, str]]:
+        """
+        Stream the fixable rows of the CSV file as (file_path, issue_type, description).
+
+        Rows shorter than the header (e.g. the last line of a report whose
+        verifier run was interrupted) are skipped, with a warning if warn.
+        """
+        path_idx, type_idx, desc_idx = self.csv_columns
+        width = self.csv_width
+
+        with open(self.csv_file, 'r', encoding='utf-8', newline='', buffering=CSV_READ_BUFFER) as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if len(row) < width:
+                    if warn and row:
+                        self.log(f"⚠ Skipping incomplete CSV row {reader.line_num}: {','.join(row)}")
+                    continue
+
+                # Only ID3 tag and artwork issues on MP3 files can be fixed,
+                # so nothing else is sent to the workers
+                issue_type = row[type_idx]
+                if (('ID3' in issue_type or 'Album Art' in issue_type)
+                        and row[path_idx][-4:].lower() == '.mp3'):
+                    yield row[path_idx], issue_type, row[desc_idx]
+
+    def _rows_are_grouped(self) -> bool:
+        """Check that each file's fixable rows are adjacent in the CSV file."""
+        seen = set()
+        previous = None
+        for file_path, _, _ in self.iter_fixable_rows(warn=False):
+            if file_path != previous:
+                if file_path in seen:
+                    return False
+                seen.add(file_path)
+                previous = file_path
+        return True
+
+    def iter_issue_groups(self) -> Iterator[Tuple[str, List[Tuple[str, str]]]]:
+        """
+        Stream fixable issues from the CSV file as (file_path, [(issue_type, description)]).
+
+        The verifier writes all rows for a file together, so groups are
+        yielded as soon as the next file starts and the whole report is never
+        held in memory. If a file's rows are split up (e.g. in reports joined
+        or edited by hand), all rows are collected by file first, so every
+        file is still fixed once with all of its issues.
+        """
+        if self._rows_are_grouped():
+            groups = (
+                (file_path, [(issue_type, description) for _, issue_type, description in file_rows])
+                for file_path, file_rows in groupby(self.iter_fixable_rows(), key=itemgetter(0))
+            )
+        else:
+            self.log("⚠ CSV rows for some files are not adjacent; reading the whole report first")
+            issues_by_file = defaultdict(list)
+            for file_path, issue_type, description in self.iter_fixable_rows():
+                issues_by_file[file_path].append((issue_type, description))
+            groups = issues_by_file.items()
+
+        group_count = 0
+        for group in groups:
+            group_count += 1
+            yield group
+
+        self.log(f"Read fixable issues for {group_count} MP3 files from {self.csv_file}")
+
     def fix_all(self):
         """Process all files and apply fixes."""
         mode = "DRY RUN" if self.dry_run else "LIVE MODE"
@@ -96,180 +304,87 @@ class VolvoUSBFixer:
         else:
             self.log("\n⚠ LIVE MODE: Files will be modified in place!")
 
-        # Load issues
-        issues_by_file = self.load_issues()
+        # Check the header before any file is touched; problems reading the
+        # rest of the CSV are reported once the files already queued finish
+        self.read_csv_header()
 
-        # Group by issue type for statistics
-        issue_types = defaultdict(int)
-        for issues in issues_by_file.values():
-            for issue in issues:
-                issue_types[issue['issue_type']] += 1
-
-        self.log(f"\nIssue breakdown:")
-        for issue_type, count in sorted(issue_types.items(), key=lambda x: -x[1]):
-            self.log(f"  {issue_type}: {count}")
-
-        # Process files in parallel
-        total_files = len(issues_by_file)
-        self.log(f"\nProcessing {total_files} files using {self.num_threads} threads...")
+        # Process files in parallel while the CSV is still being read; at
+        # most MAX_PENDING_PER_WORKER files per worker are queued at a time
+        self.log(f"\nProcessing {self.csv_file} using {self.num_workers} processes...")
 
+        issue_types = Counter()
         processed = 0
-        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-            # Submit all file fixing tasks
-            future_to_file = {
-                executor.submit(self._process_file, file_path, issues): file_path
-                for file_path, issues in issues_by_file.items()
-            }
-
-            # Process results as they complete
-            for future in as_completed(future_to_file):
-                processed += 1
-
-                try:
-                    result = future.result()
-                    # result is a tuple: (file_path, fixes_applied, success)
-                    if result:
-                        file_path, fixes_applied, success = result
-                        if fixes_applied:
-                            prefix = "✓" if success else "✗"
-                            self.log(f"{prefix} [{processed}/{total_files}] {file_path}")
-                            for fix in fixes_applied:
-                                self.log(f"    - {fix}")
-                        elif not success:
-                            self.log(f"✗ [{processed}/{total_files}] {file_path}: No fixes applied")
-                except Exception as e:
-                    file_path = future_to_file[future]
-                    self.log(f"✗ [{processed}/{total_files}] {file_path}: Unexpected error: {e}")
-                    with self.failed_files_lock:
-                        self.failed_files.append((file_path, f"Unexpected error: {e}"))
+        drive_path = str(self.drive_path)
+        pending_lines = []
+        last_flush = time.monotonic()
 
-        # Print summary
-        self.print_summary()
+        def collect(future, file_path):
+            """Merge one finished file into the statistics and buffered output."""
+            nonlocal processed, last_flush
+            processed += 1
 
-    def _process_file(self, file_path: str, issues: List[Dict]):
-        """Process a single file (thread-safe wrapper). Returns (file_path, fixes_applied, success)."""
-        full_path = self.drive_path / file_path
+            try:
+                # result is a tuple: (file_path, fixes_applied, success, stat_deltas, failure)
+                file_path, fixes_applied, success, stat_deltas, failure = future.result()
+                for fix_type, count in stat_deltas.items():
+                    self.stats[fix_type] += count
+                if failure:
+                    self.failed_files.append((file_path, failure))
+                elif fixes_applied:
+                    self.fixed_files.append((file_path, fixes_applied))
+
+                if fixes_applied:
+                    prefix = "✓" if success else "✗"
+                    pending_lines.append(f"{prefix} [{processed}] {file_path}")
+                    pending_lines.extend(f"    - {fix}" for fix in fixes_applied)
+                elif not success:
+                    pending_lines.append(f"✗ [{processed}] {file_path}: No fixes applied")
+            except Exception as e:
+                pending_lines.append(f"✗ [{processed}] {file_path}: Unexpected error: {e}")
+                self.failed_files.append((file_path, f"Unexpected error: {e}"))
 
-        if not full_path.exists():
-            with self.failed_files_lock:
-                self.failed_files.append((file_path, "File not found"))
-            return (file_path, ["File not found"], False)
+            now = time.monotonic()
+            if processed % LOG_FLUSH_FILES == 0 or now - last_flush >= LOG_FLUSH_SECONDS:
+                self.log_lines(pending_lines)
+                pending_lines.clear()
+                last_flush = now
 
-        # Only process MP3 files for now
-        if full_path.suffix.lower() == '.mp3':
-            return self.fix_mp3_file(full_path, file_path, issues)
+        read_error = None
 
-        return None
+        max_pending = self.num_workers * MAX_PENDING_PER_WORKER
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            future_to_file = {}
+            try:
+                for file_path, issues in self.iter_issue_groups():
+                    issue_types.update(issue_type for issue_type, _ in issues)
+                    future = executor.submit(process_file, drive_path, file_path, issues, self.dry_run)
+                    future_to_file[future] = file_path
+
+                    if len(future_to_file) >= max_pending:
+                        done, _ = wait(future_to_file, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future, future_to_file.pop(future))
+            except Exception as e:
+                read_error = e
 
-    def fix_mp3_file(self, full_path: Path, rel_path: str, issues: List[Dict]):
-        """Fix issues in an MP3 file. Returns (file_path, fixes_applied, success)."""
-        try:
-            # Check what types of issues this file has
-            issue_types = {issue['issue_type'] for issue in issues}
+            # Process the remaining results as they complete
+            for future in as_completed(future_to_file):
+                collect(future, future_to_file[future])
 
-            # Only process ID3 tag issues for now
-            id3_issues = [i for i in issues if 'ID3' in i['issue_type'] or 'Album Art' in i['issue_type']]
+        self.log_lines(pending_lines)
 
-            if not id3_issues:
-                return (rel_path, [], True)  # Nothing we can fix
+        # Issue types seen while streaming
+        self.log(f"\nIssue breakdown:")
+        for issue_type, count in issue_types.most_common():
+            self.log(f"  {issue_type}: {count}")
 
-            # Load the file
-            try:
-                audio = MP3(full_path)
-            except Exception as e:
-                with self.failed_files_lock:
-                    self.failed_files.append((rel_path, f"Failed to load MP3: {e}"))
-                return (rel_path, [f"Failed to load MP3: {e}"], False)
-
-            modified = False
-            fixes_applied = []
-
-            # Handle "No ID3 tags found"
-            if any("No ID3 tags found" in i['description'] for i in id3_issues):
-                if self.dry_run:
-                    fixes_applied.append("Would add basic ID3v2.3 tags")
-                else:
-                    # Create new ID3v2.3 tags
-                    audio.tags = ID3()
-                    # Add minimal tags (title from filename)
-                    title = full_path.stem
-                    audio.tags.add(TIT2(encoding=Encoding.LATIN1, text=title))
-                    modified = True
-                    fixes_applied.append("Added basic ID3v2.3 tags")
-                with self.stats_lock:
-                    self.stats['added_tags'] += 1
-
-            # Handle ID3v2.4 -> ID3v2.3 conversion
-            elif any("ID3v2.4" in i['description'] for i in id3_issues):
-                if self.dry_run:
-                    fixes_applied.append("Would convert ID3v2.4 to ID3v2.3")
-                else:
-                    if audio.tags:
-                        # Convert all text frames to LATIN1 encoding
-                        for frame in audio.tags.values():
-                            if hasattr(frame, 'encoding'):
-                                frame.encoding = Encoding.LATIN1
-                        modified = True
-                        fixes_applied.append("Converted ID3v2.4 to ID3v2.3")
-                with self.stats_lock:
-                    self.stats['converted_tags'] += 1
-
-            # Handle unusual ID3 versions (2.2, etc.)
-            elif any("Unusual ID3 version" in i['description'] for i in id3_issues):
-                if self.dry_run:
-                    fixes_applied.append("Would convert to ID3v2.3")
-                else:
-                    if audio.tags:
-                        # Convert all text frames to LATIN1 encoding
-                        for frame in audio.tags.values():
-                            if hasattr(frame, 'encoding'):
-                                frame.encoding = Encoding.LATIN1
-                        modified = True
-                        fixes_applied.append("Converted to ID3v2.3")
-                with self.stats_lock:
-                    self.stats['converted_unusual_tags'] += 1
-
-            # Handle large album art
-            if any("Large artwork" in i['description'] for i in id3_issues):
-                if self.dry_run:
-                    fixes_applied.append("Would remove large album artwork")
-                else:
-                    if audio.tags:
-                        # Remove all APIC frames (album art)
-                        audio.tags.delall('APIC')
-                        modified = True
-                        fixes_applied.append("Removed large album artwork")
-                with self.stats_lock:
-                    self.stats['removed_artwork'] += 1
-
-            # Save changes
-            if modified:
-                try:
-                    # Save with BOTH ID3v1 and ID3v2.3 for best compatibility
-                    # According to Volvo specs: "Including both ID3v1 and ID3v2.3 tags
-                    # provides the best fallback behavior"
-                    audio.save(v1=2, v2_version=3)
-                    with self.fixed_files_lock:
-                        self.fixed_files.append((rel_path, fixes_applied))
-                    with self.stats_lock:
-                        self.stats['files_modified'] += 1
-                    return (rel_path, fixes_applied, True)
-                except Exception as e:
-                    with self.failed_files_lock:
-                        self.failed_files.append((rel_path, f"Failed to save: {e}"))
-                    return (rel_path, fixes_applied + [f"Failed to save: {e}"], False)
-            elif fixes_applied:
-                # Dry run - record what would be done
-                with self.fixed_files_lock:
-                    self.fixed_files.append((rel_path, fixes_applied))
-                return (rel_path, fixes_applied, True)
-
-            return (rel_path, [], True)
+        # Print summary
+        self.print_summary()
 
-        except Exception as e:
-            with self.failed_files_lock:
-                self.failed_files.append((rel_path, f"Unexpected error: {e}"))
-            return (rel_path, [f"Unexpected error: {e}"], False)
+        if read_error is not None:
+            self.log(f"\nERROR: Failed to read CSV file: {read_error}")
+            self.log("Only the files listed before the error were processed.")
+            sys.exit(1)
 
     def print_summary(self):
         """Print summary of fixes applied."""
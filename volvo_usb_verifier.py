@@ -14,47 +14,452 @@ Requirements verified:
 - Maximum 254 files per folder
 - Maximum 8 levels of nesting
 - Path length under 60 characters
-- Audio formats: MP3, WMA, AAC, M4A, M4B (no FLAC/OGG)
+- Audio formats: MP3, WMA, AAC, M4A, M4B (no FLAC/OGG or DRM-protected M4P)
 - MP3: CBR encoding, 32-320 kbps (not 144), 32/44.1/48 kHz
 - ID3 tags: ID3v2.3 with ISO-8859-1 encoding preferred
 - Album art: 500x500 pixels or smaller
 """
 
 import os
+import re
 import sys
 import platform
 import subprocess
-import json
 import logging
+import logging.handlers
 import csv
+import importlib.util
+import json
+import errno
+import functools
+import mmap
+import struct
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from typing import Dict, List, Tuple, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
 import multiprocessing
 
+# Operating system name ("Windows", "Linux", "Darwin"), queried once
+SYSTEM = platform.system()
+
 # Fix Windows console encoding issues
-if platform.system() == "Windows":
+if SYSTEM == "Windows":
     import io
     if sys.stdout.encoding != 'utf-8':
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     if sys.stderr.encoding != 'utf-8':
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-try:
-    from mutagen.mp3 import MP3
-    from mutagen.id3 import ID3
-    from mutagen.aac import AAC
-    from mutagen.asf import ASF
-    from mutagen.mp4 import MP4
-    from mutagen.flac import FLAC
-    from mutagen.oggvorbis import OggVorbis
-except ImportError:
+# mutagen is imported by the format checks on first use (in the worker
+# processes), so only check that it is installed here
+if importlib.util.find_spec('mutagen') is None:
     print("ERROR: This script requires the 'mutagen' library.")
     print("Install it with: pip install mutagen")
     sys.exit(1)
 
+# One row of the CSV report. Issues are plain tuples rather than dicts, so
+# they pickle compactly on the way back from the worker processes
+Issue = namedtuple('Issue', ['file_path', 'issue_type', 'severity', 'description'])
+# Result of checking one audio file: (console lines, CSV rows)
+FileIssues = Tuple[List[str], List[Issue]]
+
+# Audio check results from earlier runs, keyed by file, size and modification time
+RESULT_CACHE_PATH = Path.home() / ".cache" / "volvo-usb-verifier" / "verify_results.json"
+# Bump whenever the audio checks change so cached results are recomputed
+RESULT_CACHE_VERSION = 5
+
+# Threads listing folders at once while the drive is scanned; enough to keep
+# several reads in flight on UAS drives and network mounts, where each
+# directory read has high latency
+SCAN_THREADS = 16
+# Largest batch of audio files sent to a worker process at once
+AUDIO_CHUNK_SIZE = 64
+# Audio worklists up to this size are checked by threads in this process
+# instead of by worker processes
+THREADED_AUDIO_FILES = 64
+# Bytes of each file read ahead before parsing (ID3v2 header and first frames)
+HEADER_PREFETCH_SIZE = 64 * 1024
+# Seconds between progress line updates (only shown on a terminal)
+PROGRESS_INTERVAL = 0.25
+# File issue lines printed by verify_audio_files (all issues go to the CSV)
+ISSUE_PREVIEW_LINES = 20
+# CSV rows held in memory before they are written to the report
+CSV_FLUSH_ROWS = 1024
+# Rule line framing the console and log report sections
+REPORT_RULE = "=" * 70
+# Bytes read from the start of an APIC frame to find where the image begins
+APIC_HEADER_READ = 1024
+
+
+class _MappedFile:
+    """
+    Read-only file object over a memory-mapped file.
+
+    Unlike mmap.seek, seeking past the end is allowed (later reads return
+    b''), so mutagen sees truncated files the same way as with a real file.
+    """
+
+    def __init__(self, mapped: mmap.mmap):
+        self._mapped = mapped
+        self._size = len(mapped)
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        start = self._pos
+        end = self._size if size is None or size < 0 else min(start + size, self._size)
+        if start >= end:
+            return b''
+        self._pos = end
+        return self._mapped[start:end]
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise OSError(errno.EINVAL, os.strerror(errno.EINVAL))
+        self._pos = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._pos
+
+
+@contextmanager
+def _mapped_file(file_path: str):
+    """
+    Open an audio file memory-mapped for mutagen to parse.
+
+    mutagen then reads slices of the page cache instead of going through a
+    buffered file object. Files that cannot be mapped (e.g. empty files) are
+    handed over as the open file object instead.
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            mapped = None
+
+        if mapped is None:
+            yield f
+            return
+        with mapped:
+            yield _MappedFile(mapped)
+
+
+def _synchsafe(data: bytes) -> Optional[int]:
+    """Decode an ID3v2 synchsafe integer (7 bits per byte), or None if it is invalid."""
+    value = 0
+    for byte in data:
+        if byte & 0x80:
+            return None
+        value = (value << 7) | byte
+    return value
+
+
+def _apic_image_size(body: bytes, frame_size: int) -> Optional[int]:
+    """
+    Return the image size of an APIC frame from the start of its body.
+
+    The body starts with an encoding byte, a MIME type, a picture type byte
+    and a description; the image data is the rest of the frame. Returns None
+    if the description does not end within the bytes read.
+    """
+    if not body or body[0] > 3:
+        return None
+    mime_end = body.find(b'\x00', 1)
+    if mime_end == -1:
+        return None
+    start = mime_end + 2
+
+    if body[0] in (0, 3):
+        # Latin-1 / UTF-8 description ends with a single null
+        desc_end = body.find(b'\x00', start)
+        if desc_end == -1:
+            return None
+        return frame_size - (desc_end + 1)
+
+    # UTF-16 description ends with a null code unit
+    desc_end = body.find(b'\x00\x00', start)
+    while desc_end != -1 and (desc_end - start) % 2:
+        desc_end = body.find(b'\x00\x00', desc_end + 1)
+    if desc_end == -1:
+        return None
+    return frame_size - (desc_end + 2)
+
+
+def _scan_id3v2(fileobj) -> Optional[Tuple[Tuple[int, int, int], int, List[int]]]:
+    """
+    Read an ID3v2.3/2.4 tag's version and embedded image sizes from frame headers.
+
+    Frames are skipped by seeking, so artwork is never read into memory.
+    Returns (version, tag_size, image_sizes), or None if the file has no
+    ID3v2 tag or the tag uses anything this reader does not handle (ID3v2.2,
+    unsynchronisation, extended headers, compressed or encrypted frames, or
+    an inconsistent frame layout). Callers then fall back to mutagen.
+    """
+    fileobj.seek(0)
+    header = fileobj.read(10)
+    if len(header) < 10 or header[:3] != b'ID3':
+        return None
+    major, revision, flags = header[3], header[4], header[5]
+    if major not in (3, 4) or flags & 0xC0:
+        return None
+    size = _synchsafe(header[6:10])
+    if size is None:
+        return None
+
+    # ID3v2.3: compression, encryption, grouping
+    # ID3v2.4: grouping, compression, encryption, unsynchronisation, data length
+    format_flags = 0xE0 if major == 3 else 0x4F
+    end = 10 + size
+    pos = 10
+    frames = 0
+    image_sizes = []
+
+    while pos + 10 <= end:
+        fileobj.seek(pos)
+        frame_header = fileobj.read(10)
+        if len(frame_header) < 10:
+            return None
+        frame_id = frame_header[:4]
+        if frame_id == b'\x00\x00\x00\x00':
+            break  # Padding
+        if not frame_id.isalnum() or frame_id != frame_id.upper():
+            return None
+
+        if major == 4:
+            frame_size = _synchsafe(frame_header[4:8])
+            if frame_size is None:
+                return None
+        else:
+            frame_size = int.from_bytes(frame_header[4:8], 'big')
+        if frame_header[9] & format_flags or pos + 10 + frame_size > end:
+            return None
+
+        if frame_id == b'APIC':
+            image_size = _apic_image_size(fileobj.read(min(frame_size, APIC_HEADER_READ)), frame_size)
+            if image_size is None:
+                return None
+            image_sizes.append(image_size)
+
+        frames += 1
+        pos += 10 + frame_size
+
+    if not frames:
+        return None
+
+    tag_size = end + (10 if flags & 0x10 else 0)
+    return (2, major, revision), tag_size, image_sizes
+
+
+def _is_untagged(fileobj) -> bool:
+    """
+    Return True if the file certainly has neither an ID3v2 nor an ID3v1 tag.
+
+    Checks the "ID3" magic at the start and, like mutagen, looks for b'TAG'
+    anywhere in the last 131 bytes (an ID3v1 tag is the last 128, and an
+    APEv2 footer may end with "TAG" just before it).
+    """
+    fileobj.seek(0)
+    if fileobj.read(3) == b'ID3':
+        return False
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(max(0, size - 131))
+    return b'TAG' not in fileobj.read(131)
+
+
+# MPEG audio frame header tables, indexed by the header's bit fields
+# (version bits 01 and layer bits 00 are reserved)
+_MPEG_VERSIONS = (2.5, None, 2, 1)
+_MPEG_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MPEG_BITRATES[(2, 3)] = _MPEG_BITRATES[(2, 2)]
+for _layer in (1, 2, 3):
+    _MPEG_BITRATES[(2.5, _layer)] = _MPEG_BITRATES[(2, _layer)]
+_MPEG_SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+# Consecutive frame headers that must decode before the stream is trusted
+_MPEG_SYNC_FRAMES = 4
+# Bytes read to decode those frames: three of the longest possible frames
+# (6148 bytes, MPEG 2.5 layer I) plus a header and the VBRI tag offset
+_MPEG_SCAN_READ = 20 * 1024
+_MPEG_HEADER = struct.Struct('>I')
+
+
+def _scan_cbr_mpeg_stream(fileobj, offset: int) -> Optional[Tuple[int, int]]:
+    """
+    Read the bitrate and sample rate of an MPEG stream from its first frame headers.
+
+    Handles the common case of a stream starting right at offset (just
+    after the ID3v2 tag) with no Xing/Info or VBRI header: the first
+    _MPEG_SYNC_FRAMES frames must all decode, and the first one's bitrate is
+    the file's. This is what mutagen's MPEGInfo reports for such files, but
+    without its bit-by-bit reader. Returns (bitrate, sample_rate) in bps and
+    Hz, or None for anything else (VBR headers, junk before the first frame,
+    stacked ID3 tags, truncated files), in which case callers use MPEGInfo.
+    """
+    fileobj.seek(offset)
+    buf = fileobj.read(_MPEG_SCAN_READ)
+    # A short read means buf reaches the end of the file; otherwise bytes
+    # past buf are unknown and anything needing them goes to mutagen
+    at_eof = len(buf) < _MPEG_SCAN_READ
+    result = None
+    pos = 0
+    for _ in range(_MPEG_SYNC_FRAMES):
+        if pos + 40 > len(buf) and not at_eof:
+            return None
+        if pos + 4 > len(buf):
+            return None
+        bits, = _MPEG_HEADER.unpack_from(buf, pos)
+        version = _MPEG_VERSIONS[(bits >> 19) & 0x3]
+        layer = 4 - ((bits >> 17) & 0x3)
+        bitrate_index = (bits >> 12) & 0xF
+        sample_rate_index = (bits >> 10) & 0x3
+        if (bits >> 21 != 0x7FF or version is None or layer == 4
+                or sample_rate_index == 3 or bitrate_index in (0, 0xF)):
+            return None
+
+        bitrate = _MPEG_BITRATES[(version, layer)][bitrate_index] * 1000
+        sample_rate = _MPEG_SAMPLE_RATES[version][sample_rate_index]
+        mono = (bits >> 6) & 0x3 == 3
+
+        if layer == 1:
+            frame_samples, slot = 384, 4
+        elif version >= 2 and layer == 3:
+            frame_samples, slot = 576, 1
+        else:
+            frame_samples, slot = 1152, 1
+
+        if layer == 3:
+            # A Xing/Info or VBRI header describes the real (average)
+            # bitrate and encoding mode; leave those files to mutagen
+            if version == 1:
+                xing_offset = 21 if mono else 36
+            else:
+                xing_offset = 13 if mono else 21
+            if buf[pos + xing_offset:pos + xing_offset + 4] in (b'Xing', b'Info'):
+                return None
+            if buf[pos + 36:pos + 40] == b'VBRI':
+                return None
+
+        if result is None:
+            result = bitrate, sample_rate
+        padding = (bits >> 9) & 0x1
+        pos += ((frame_samples // 8 * bitrate) // sample_rate + padding) * slot
+
+    return result
+
+
+# Atom types an MP4/QuickTime file can start with (ftyp in nearly all of them)
+_MP4_FIRST_ATOMS = frozenset({
+    b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'uuid', b'pnot',
+    b'pdin', b'styp', b'sidx', b'moof', b'meta', b'junk',
+})
+
+
+def _is_mp4_container(fileobj) -> bool:
+    """
+    Check from its first 8 bytes whether the file starts like an MP4 container.
+
+    MP3 or raw ADTS streams renamed to .m4a and damaged files fail here
+    instead of having mutagen walk their data as if it were atoms.
+    """
+    fileobj.seek(0)
+    header = fileobj.read(8)
+    fileobj.seek(0)
+    return len(header) == 8 and header[4:8] in _MP4_FIRST_ATOMS
+
+
+def _check_mp4_cover_atom(atom, fileobj):
+    """
+    Run mutagen's checks on a 'covr' atom without reading the images.
+
+    Mirrors MP4Tags' handling of cover art: a truncated atom raises
+    MP4MetadataError, a data atom header cut short raises struct.error, and
+    any other malformed content is ignored (mutagen keeps it as a failed
+    atom). Only the 12-byte header of each image is read.
+    """
+    from mutagen.mp4 import MP4MetadataError
+
+    data_offset = atom.offset + atom.length - atom.datalength
+    fileobj.seek(0, os.SEEK_END)
+    if fileobj.tell() < data_offset + atom.datalength:
+        raise MP4MetadataError("Not enough data")
+
+    pos = 0
+    while pos < atom.length - 8:
+        fileobj.seek(data_offset + pos)
+        length, name, _ = struct.unpack(">I4sI", fileobj.read(max(0, min(12, atom.datalength - pos))))
+        if name != b"data" and name != b"name":
+            return
+        if length < 1:
+            return
+        pos += length
+
+
+_mp4_without_artwork = None
+
+
+def _mp4_class():
+    """
+    Return an MP4 subclass that checks cover art without loading it.
+
+    The format check only needs the stream info, but mutagen reads every
+    tag atom, including cover images that can be several MB. Tags other
+    than 'covr' are still loaded by mutagen in file order, so any error
+    they raise is reported exactly as before.
+    """
+    global _mp4_without_artwork
+    if _mp4_without_artwork is not None:
+        return _mp4_without_artwork
+
+    from mutagen.mp4 import MP4, MP4Tags
+
+    class MP4TagsWithoutArtwork(MP4Tags):
+        def load(self, atoms, fileobj):
+            try:
+                ilst = atoms.path(b"moov", b"udta", b"meta", b"ilst")[-1]
+            except KeyError:
+                return super().load(atoms, fileobj)
+
+            # Let mutagen load each run of atoms between the cover atoms
+            children = ilst.children
+            try:
+                ilst.children = []
+                super().load(atoms, fileobj)
+                run = []
+                for atom in children:
+                    if atom.name != b"covr":
+                        run.append(atom)
+                        continue
+                    if run:
+                        ilst.children = run
+                        super().load(atoms, fileobj)
+                        run = []
+                    _check_mp4_cover_atom(atom, fileobj)
+                if run:
+                    ilst.children = run
+                    super().load(atoms, fileobj)
+            finally:
+                ilst.children = children
+
+    class MP4WithoutArtwork(MP4):
+        MP4Tags = MP4TagsWithoutArtwork
+
+    _mp4_without_artwork = MP4WithoutArtwork
+    return _mp4_without_artwork
+
 
 class VolvoUSBVerifier:
     """Verifies USB drive and media files for Volvo XC70 2012 compatibility."""
@@ -67,57 +472,119 @@ class VolvoUSBVerifier:
     MAX_PATH_LENGTH = 60
     MAX_FILENAME_LENGTH = 64  # Including extension
     RECOMMENDED_CLUSTER_SIZE = 32768  # 32KB
-    SUPPORTED_FORMATS = {'.mp3', '.wma', '.aac', '.m4a', '.m4b'}
-    UNSUPPORTED_FORMATS = {'.flac', '.ogg', '.wav', '.ape', '.alac'}
+    SUPPORTED_FORMATS = frozenset({'.mp3', '.wma', '.aac', '.m4a', '.m4b'})
+    # .m4p is iTunes DRM-protected AAC, rejected by name without parsing it
+    UNSUPPORTED_FORMATS = frozenset({'.flac', '.ogg', '.wav', '.ape', '.alac', '.m4p'})
+    # Tuples for str.endswith, which checks every suffix in one call
+    SUPPORTED_SUFFIXES = tuple(SUPPORTED_FORMATS)
+    UNSUPPORTED_SUFFIXES = tuple(UNSUPPORTED_FORMATS)
     FORBIDDEN_BITRATE = 144
-    VALID_SAMPLE_RATES = {32000, 44100, 48000}
+    VALID_SAMPLE_RATES = frozenset({32000, 44100, 48000})
+    # Every rate in the AAC sampling frequency table from 8 to 96 kHz
+    VALID_AAC_SAMPLE_RATES = frozenset({8000, 11025, 12000, 16000, 22050, 24000,
+                                        32000, 44100, 48000, 64000, 88200, 96000})
     MIN_BITRATE = 32
     MAX_BITRATE = 320
     MAX_ALBUM_ART_SIZE = (500, 500)
     # Extended ASCII characters that may cause issues
-    UNSAFE_CHARS = set('üéñàèìòùáíóúäëïöüÿâêîôûãõçøåæœ¿¡«»°±²³µ¶·¸¹º¼½¾×÷')
+    UNSAFE_CHARS = frozenset('üéñàèìòùáíóúäëïöüÿâêîôûãõçøåæœ¿¡«»°±²³µ¶·¸¹º¼½¾×÷')
+    # Every byte of the UTF-8 encoded unsafe characters, for bytes.translate
+    _UNSAFE_BYTES = bytes(set(''.join(sorted(UNSAFE_CHARS)).encode('utf-8')))
 
-    def __init__(self, drive_path: str, num_threads: Optional[int] = None):
+    def __init__(self, drive_path: str, num_workers: Optional[int] = None,
+                 use_cache: bool = True, result_cache_path: Path = RESULT_CACHE_PATH):
         self.drive_path = Path(drive_path)
+        self.use_cache = use_cache
+        self.result_cache_path = Path(result_cache_path)
+        # Paths under the drive start with this prefix, so relative paths are
+        # a plain slice (the root itself may end in a separator, e.g. "E:\\")
+        self._drive_str = str(self.drive_path)
+        self._drive_prefix_len = len(self._drive_str.rstrip(os.sep)) + 1
         self.errors = []
         self.warnings = []
         self.info = []
         self.file_stats = defaultdict(int)
-        self.problem_files = []  # Track all problem files for CSV export
-        # Use os.cpu_count() which returns thread count (logical processors)
-        self.num_threads = num_threads or (os.cpu_count() or 4) * 2
+        # Problem files for the CSV report. Once csv_file is set, rows are
+        # written out in batches as they are found and this only holds the
+        # ones not yet written
+        self.problem_files = []
+        self._problem_rows_written = 0
+        self._csv_out = None
+        self._csv_writer = None
+        self._csv_error = None
+        # mutagen parsing is CPU-bound, so use one worker process per logical CPU
+        self.num_workers = num_workers or os.cpu_count() or 4
         self.start_time = None
         self.logger = logging.getLogger('VolvoUSBVerifier')
         self.csv_file = None
+        # Format-specific checks by lowercased extension
+        self._ext_handlers = {
+            '.mp3': self._verify_mp3,
+            '.wma': self._verify_wma,
+            '.aac': self._verify_aac_m4a,
+            '.m4a': self._verify_aac_m4a,
+            '.m4b': self._verify_aac_m4a,
+        }
+        # Windows volume details by drive letter, so they are queried only once
+        self._windows_volume_info = {}
+        # Progress lines are overwritten in place, which only makes sense on
+        # a terminal; piped and redirected runs get just the report
+        self._show_progress = sys.stdout.isatty()
+        self._next_progress = 0.0
+
+    def _progress_due(self) -> bool:
+        """Return True when a progress line should be printed (at most every PROGRESS_INTERVAL seconds)."""
+        if not self._show_progress:
+            return False
+        now = time.monotonic()
+        if now < self._next_progress:
+            return False
+        self._next_progress = now + PROGRESS_INTERVAL
+        return True
+
+    def _clear_progress(self):
+        """Blank out the last progress line."""
+        if self._show_progress:
+            print(" " * 80, end='\r')
 
     def log(self, message: str):
         """Log message to both console and file."""
         print(message)
         self.logger.info(message)
 
+    def log_lines(self, lines: List[str]):
+        """Log several messages with a single console write and log record."""
+        if lines:
+            self.log('\n'.join(lines))
+
     def verify_all(self) -> bool:
         """Run all verification checks. Returns True if all critical checks pass."""
         self.start_time = datetime.now()
 
         self.log(f"Verifying USB drive at: {self.drive_path}")
-        self.log(f"Using {self.num_threads} threads for file analysis")
-        self.log("=" * 70)
-
-        # Filesystem checks
-        self.verify_filesystem()
+        self.log(f"Using {self.num_workers} processes for file analysis")
+        self.log(REPORT_RULE)
+
+        # Filesystem checks mostly wait on the drive or, on macOS, on
+        # diskutil, so run them while the drive is scanned. They are joined
+        # before verify_structure adds its results, so the report order
+        # does not change
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            filesystem_check = executor.submit(self.verify_filesystem)
+            scan = self._walk_and_classify()
+            filesystem_check.result()
 
         # File and folder structure checks
-        self.verify_structure()
+        self.verify_structure(scan)
 
         # Audio file checks
-        self.verify_audio_files()
+        self.verify_audio_files(scan)
 
         # Print report
         self.print_report()
 
-        # Export CSV of problem files
-        if self.problem_files:
-            self.export_csv()
+        # Write the rest of the CSV report
+        self.export_csv()
 
         # Print elapsed time
         elapsed = datetime.now() - self.start_time
@@ -129,16 +596,96 @@ class VolvoUSBVerifier:
         """Verify filesystem type, partition scheme, and cluster size."""
         print("\n[1/3] Verifying filesystem...")
 
-        system = platform.system()
-
-        if system == "Windows":
+        if SYSTEM == "Windows":
             self._verify_filesystem_windows()
-        elif system == "Linux":
+        elif SYSTEM == "Linux":
             self._verify_filesystem_linux()
-        elif system == "Darwin":  # macOS
+        elif SYSTEM == "Darwin":  # macOS
             self._verify_filesystem_macos()
         else:
-            self.warnings.append(f"Filesystem verification not implemented for {system}")
+            self.warnings.append(f"Filesystem verification not implemented for {SYSTEM}")
+
+    # DeviceIoControl code returning PARTITION_INFORMATION_EX for a volume,
+    # whose first field is the partition style (0 = MBR, 1 = GPT, 2 = RAW)
+    IOCTL_DISK_GET_PARTITION_INFO_EX = 0x00070048
+    PARTITION_INFO_EX_SIZE = 144
+
+    def _get_windows_volume_info(self, drive_letter: str) -> Optional[Dict]:
+        """
+        Query filesystem, cluster size and partition style for a drive letter.
+
+        Uses the Win32 volume APIs through ctypes rather than spawning
+        external tools. The result is cached per verifier.
+        """
+        if drive_letter in self._windows_volume_info:
+            return self._windows_volume_info[drive_letter]
+
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        root = f"{drive_letter[0]}:\\"
+
+        fs_name = ctypes.create_unicode_buffer(261)
+        if not kernel32.GetVolumeInformationW(root, None, 0, None, None, None, fs_name, len(fs_name)):
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        sectors_per_cluster = wintypes.DWORD()
+        bytes_per_sector = wintypes.DWORD()
+        free_clusters = wintypes.DWORD()
+        total_clusters = wintypes.DWORD()
+        if not kernel32.GetDiskFreeSpaceW(
+            root, ctypes.byref(sectors_per_cluster), ctypes.byref(bytes_per_sector),
+            ctypes.byref(free_clusters), ctypes.byref(total_clusters)
+        ):
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        info = {
+            'FileSystem': fs_name.value,
+            'AllocationUnitSize': sectors_per_cluster.value * bytes_per_sector.value,
+            'PartitionStyle': self._get_windows_partition_style(kernel32, drive_letter),
+        }
+        self._windows_volume_info[drive_letter] = info
+        return info
+
+    def _get_windows_partition_style(self, kernel32, drive_letter: str) -> Optional[str]:
+        """Return 'MBR' or 'GPT' for the partition holding a drive letter, or None if unknown."""
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        kernel32.CreateFileW.argtypes = [
+            wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+            wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE
+        ]
+        kernel32.DeviceIoControl.argtypes = [
+            wintypes.HANDLE, wintypes.DWORD, wintypes.LPVOID, wintypes.DWORD,
+            wintypes.LPVOID, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD), wintypes.LPVOID
+        ]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+        # Opening the volume with no access rights is enough for this query
+        # and does not need administrator privileges
+        file_share_read_write = 0x1 | 0x2
+        open_existing = 3
+        handle = kernel32.CreateFileW(
+            f"\\\\.\\{drive_letter[0]}:", 0, file_share_read_write, None, open_existing, 0, None
+        )
+        if handle is None or handle == wintypes.HANDLE(-1).value:
+            return None
+
+        try:
+            buffer = ctypes.create_string_buffer(self.PARTITION_INFO_EX_SIZE)
+            returned = wintypes.DWORD()
+            if not kernel32.DeviceIoControl(
+                handle, self.IOCTL_DISK_GET_PARTITION_INFO_EX, None, 0,
+                buffer, len(buffer), ctypes.byref(returned), None
+            ):
+                return None
+            style = int.from_bytes(buffer.raw[:4], 'little')
+            return {0: 'MBR', 1: 'GPT'}.get(style)
+        finally:
+            kernel32.CloseHandle(handle)
 
     def _verify_filesystem_windows(self):
         """Windows-specific filesystem verification."""
@@ -150,116 +697,93 @@ class VolvoUSBVerifier:
                 self.warnings.append("Could not determine drive letter. Skipping filesystem checks.")
                 return
 
-            # Use wmic to get filesystem info
-            cmd = f'wmic volume where "DriveLetter=\'{drive_letter}\'" get FileSystem,BlockSize /format:list'
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            info = self._get_windows_volume_info(drive_letter)
 
-            if result.returncode == 0:
-                output = result.stdout
+            # Check filesystem
+            fs_type = info.get('FileSystem') or "Unknown"
+            if fs_type.upper() == "FAT32":
+                self.info.append("✓ Filesystem is FAT32")
+            elif fs_type.upper() == "FAT":
+                self.info.append("✓ Filesystem is FAT16 (also compatible)")
+            else:
+                self.errors.append(f"✗ Filesystem is {fs_type}, must be FAT32")
 
-                # Parse filesystem
-                if "FileSystem=FAT32" in output:
-                    self.info.append("✓ Filesystem is FAT32")
-                elif "FileSystem=FAT" in output:
-                    self.info.append("✓ Filesystem is FAT16 (also compatible)")
+            # Check cluster size
+            block_size = info.get('AllocationUnitSize')
+            if block_size:
+                if block_size == self.RECOMMENDED_CLUSTER_SIZE:
+                    self.info.append(f"✓ Cluster size is 32KB (optimal)")
                 else:
-                    fs_match = [line for line in output.split('\n') if 'FileSystem=' in line]
-                    fs_type = fs_match[0].split('=')[1].strip() if fs_match else "Unknown"
-                    self.errors.append(f"✗ Filesystem is {fs_type}, must be FAT32")
-
-                # Parse cluster size
-                block_match = [line for line in output.split('\n') if 'BlockSize=' in line]
-                if block_match:
-                    block_size = int(block_match[0].split('=')[1].strip())
-                    if block_size == self.RECOMMENDED_CLUSTER_SIZE:
-                        self.info.append(f"✓ Cluster size is 32KB (optimal)")
-                    else:
-                        self.warnings.append(
-                            f"⚠ Cluster size is {block_size} bytes. "
-                            f"Recommended: {self.RECOMMENDED_CLUSTER_SIZE} bytes (32KB)"
-                        )
+                    self.warnings.append(
+                        f"⚠ Cluster size is {block_size} bytes. "
+                        f"Recommended: {self.RECOMMENDED_CLUSTER_SIZE} bytes (32KB)"
+                    )
 
-            # Check partition scheme using diskpart
-            disk_num = self._get_disk_number_windows(drive_letter)
-            if disk_num is not None:
-                self._check_partition_scheme_windows(disk_num)
+            # Check partition scheme
+            style = info.get('PartitionStyle')
+            if style == 'MBR':
+                self.info.append("✓ Partition scheme is MBR")
+            elif style == 'GPT':
+                self.errors.append("✗ Partition scheme is GPT, must be MBR")
+            else:
+                self.warnings.append("⚠ Could not determine partition scheme")
 
         except Exception as e:
             self.warnings.append(f"Could not verify filesystem details: {e}")
 
-    def _get_disk_number_windows(self, drive_letter: str) -> Optional[int]:
-        """Get physical disk number for a drive letter on Windows."""
-        try:
-            cmd = f'wmic partition where "DeviceID LIKE \'%{drive_letter[0]}%\'" get DiskIndex /format:list'
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'DiskIndex=' in line:
-                        return int(line.split('=')[1].strip())
-        except Exception:
-            pass
-        return None
+    def _linux_mount_fstype(self) -> Optional[str]:
+        """
+        Return the filesystem type mounted at the drive path, or None if it is not a mount point.
 
-    def _check_partition_scheme_windows(self, disk_num: int):
-        """Check if disk uses MBR partition scheme on Windows."""
+        Reads /proc/self/mounts rather than starting findmnt; findmnt is only
+        used if the mount table cannot be read.
+        """
         try:
-            # Create diskpart script
-            script_content = f"select disk {disk_num}\ndetail disk\nexit\n"
-            script_path = Path.home() / "volvo_verify_temp.txt"
-
-            with open(script_path, 'w') as f:
-                f.write(script_content)
-
+            with open('/proc/self/mounts', 'r', encoding='utf-8', errors='replace') as f:
+                mounts = f.read()
+        except OSError:
             result = subprocess.run(
-                ['diskpart', '/s', str(script_path)],
+                ['findmnt', '-n', '-o', 'FSTYPE', self._drive_str],
                 capture_output=True,
                 text=True
             )
-
-            script_path.unlink()
-
-            if result.returncode == 0:
-                output = result.stdout.lower()
-                if 'partition style: mbr' in output or 'partition style : mbr' in output:
-                    self.info.append("✓ Partition scheme is MBR")
-                elif 'gpt' in output:
-                    self.errors.append("✗ Partition scheme is GPT, must be MBR")
-                else:
-                    self.warnings.append("⚠ Could not determine partition scheme")
-        except Exception as e:
-            self.warnings.append(f"Could not verify partition scheme: {e}")
+            parts = result.stdout.split()
+            return parts[0] if result.returncode == 0 and parts else None
+
+        # Mount points escape spaces and other special characters as octal
+        # (e.g. \040); the last matching entry is the one mounted on top
+        target = os.path.realpath(self._drive_str)
+        fstype = None
+        for line in mounts.splitlines():
+            fields = line.split()
+            if len(fields) < 3:
+                continue
+            mount_point = re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), fields[1])
+            if mount_point == target:
+                fstype = fields[2]
+        return fstype
 
     def _verify_filesystem_linux(self):
         """Linux-specific filesystem verification."""
         try:
             # Get mount info
-            result = subprocess.run(
-                ['findmnt', '-n', '-o', 'FSTYPE,OPTIONS', str(self.drive_path)],
-                capture_output=True,
-                text=True
-            )
-
-            if result.returncode == 0:
-                parts = result.stdout.strip().split()
-                if len(parts) >= 1:
-                    fstype = parts[0].lower()
-                    if 'fat32' in fstype or 'vfat' in fstype:
-                        self.info.append("✓ Filesystem is FAT32")
-                    elif 'fat' in fstype:
-                        self.info.append("✓ Filesystem is FAT (compatible)")
-                    else:
-                        self.errors.append(f"✗ Filesystem is {fstype}, must be FAT32")
-
-            # Try to get block size
-            result = subprocess.run(
-                ['stat', '-f', '-c', '%S', str(self.drive_path)],
-                capture_output=True,
-                text=True
-            )
+            fstype = self._linux_mount_fstype()
+            if fstype:
+                fstype = fstype.lower()
+                if 'fat32' in fstype or 'vfat' in fstype:
+                    self.info.append("✓ Filesystem is FAT32")
+                elif 'fat' in fstype:
+                    self.info.append("✓ Filesystem is FAT (compatible)")
+                else:
+                    self.errors.append(f"✗ Filesystem is {fstype}, must be FAT32")
 
-            if result.returncode == 0:
-                block_size = int(result.stdout.strip())
+            # Try to get block size (the fundamental block size that
+            # `stat -f -c %S` reports)
+            try:
+                block_size = os.statvfs(self._drive_str).f_frsize
+            except OSError:
+                block_size = None
+            if block_size is not None:
                 if block_size == self.RECOMMENDED_CLUSTER_SIZE:
                     self.info.append("✓ Cluster size is 32KB (optimal)")
                 else:
@@ -270,130 +794,332 @@ class VolvoUSBVerifier:
         except Exception as e:
             self.warnings.append(f"Could not verify filesystem details: {e}")
 
+    # "Key: value" lines of `diskutil info` output used by the macOS checks
+    DISKUTIL_FIELD_RE = re.compile(
+        r'^\s*(File System Personality|Type \(Bundle\)|Allocation Block Size|Partition Type):\s*(.*?)\s*$',
+        re.MULTILINE
+    )
+
     def _verify_filesystem_macos(self):
         """macOS-specific filesystem verification."""
         try:
             # Get disk info
             result = subprocess.run(
-                ['diskutil', 'info', str(self.drive_path)],
+                ['diskutil', 'info', self._drive_str],
                 capture_output=True,
                 text=True
             )
 
             if result.returncode == 0:
-                output = result.stdout
-
-                # Check filesystem
-                for line in output.split('\n'):
-                    if 'File System Personality:' in line or 'Type (Bundle):' in line:
-                        if 'FAT32' in line or 'MS-DOS FAT32' in line:
-                            self.info.append("✓ Filesystem is FAT32")
-                        elif 'FAT' in line:
-                            self.info.append("✓ Filesystem is FAT (compatible)")
-                        else:
-                            self.errors.append(f"✗ Filesystem is not FAT32: {line}")
-
-                    if 'Allocation Block Size:' in line or 'Device Block Size:' in line:
-                        size_str = line.split(':')[1].strip()
-                        if 'Bytes' in size_str:
-                            size = int(size_str.split()[0])
-                            if size == self.RECOMMENDED_CLUSTER_SIZE:
-                                self.info.append("✓ Cluster size is 32KB (optimal)")
-                            else:
-                                self.warnings.append(
-                                    f"⚠ Cluster size is {size} bytes. "
-                                    f"Recommended: {self.RECOMMENDED_CLUSTER_SIZE} bytes (32KB)"
-                                )
-
-                    if 'Partition Type:' in line:
-                        if 'MBR' in line or 'FDisk_partition_scheme' in line:
-                            self.info.append("✓ Partition scheme is MBR")
-                        elif 'GPT' in line or 'GUID_partition_scheme' in line:
-                            self.errors.append("✗ Partition scheme is GPT, must be MBR")
+                fields = dict(self.DISKUTIL_FIELD_RE.findall(result.stdout))
+
+                # Check filesystem ("Type (Bundle)" is the short name, e.g. msdos)
+                fs_type = fields.get('File System Personality') or fields.get('Type (Bundle)')
+                if fs_type:
+                    if 'FAT32' in fs_type:
+                        self.info.append("✓ Filesystem is FAT32")
+                    elif 'FAT' in fs_type or fs_type == 'msdos':
+                        self.info.append("✓ Filesystem is FAT (compatible)")
+                    else:
+                        self.errors.append(f"✗ Filesystem is {fs_type}, must be FAT32")
+
+                # Check cluster size
+                size_str = fields.get('Allocation Block Size', '')
+                if 'Bytes' in size_str:
+                    size = int(size_str.split()[0])
+                    if size == self.RECOMMENDED_CLUSTER_SIZE:
+                        self.info.append("✓ Cluster size is 32KB (optimal)")
+                    else:
+                        self.warnings.append(
+                            f"⚠ Cluster size is {size} bytes. "
+                            f"Recommended: {self.RECOMMENDED_CLUSTER_SIZE} bytes (32KB)"
+                        )
+
+                # Check partition scheme
+                partition_type = fields.get('Partition Type', '')
+                if 'MBR' in partition_type or 'FDisk_partition_scheme' in partition_type:
+                    self.info.append("✓ Partition scheme is MBR")
+                elif 'GPT' in partition_type or 'GUID_partition_scheme' in partition_type:
+                    self.errors.append("✗ Partition scheme is GPT, must be MBR")
         except Exception as e:
             self.warnings.append(f"Could not verify filesystem details: {e}")
 
-    def verify_structure(self):
-        """Verify file and folder structure limits."""
-        print("\n[2/3] Verifying file and folder structure...")
-
+    @staticmethod
+    def _extension(name: str) -> str:
+        """Return the lowercased extension of a filename ('' if it has none)."""
+        dot = name.rfind('.')
+        if dot <= 0:
+            return ''
+        return name[dot:].lower()
+
+    @staticmethod
+    def _scan_dir(path: str):
+        """
+        List one folder, returning (subdir_entries, dir_names, file_entries), or None if unreadable.
+
+        subdir_entries are the folders to descend into; dir_names also
+        includes symlinks to folders, which os.walk lists but does not follow.
+        Entries are classified from the file type in the listing itself
+        (follow_symlinks=False), so only symlinks, which FAT drives do not
+        have, cost an extra stat() call.
+
+        Runs on the traversal threads; os.scandir releases the GIL while it
+        waits on the drive, so several folders are listed at once.
+        """
+        subdirs = []
+        dir_names = []
+        files = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry)
+                            dir_names.append(entry.name)
+                            continue
+                        is_linked_dir = entry.is_symlink() and entry.is_dir()
+                    except OSError:
+                        is_linked_dir = False
+                    if is_linked_dir:
+                        dir_names.append(entry.name)
+                    else:
+                        files.append(entry)
+        except OSError:
+            return None
+        return subdirs, dir_names, files
+
+    def _unsafe_chars(self, text: str) -> frozenset:
+        """Return the unsafe characters in text (an empty set for most names)."""
+        # Every unsafe character is non-ASCII, so most names are done here
+        if text.isascii():
+            return frozenset()
+        # Otherwise delete the unsafe characters' bytes from the UTF-8 form
+        # in one C call, which is much cheaper than building a set of every
+        # character. Bytes shared with safe characters can only cause a
+        # false alarm, which the exact check below sorts out. surrogatepass
+        # encodes any lone surrogate: undecodable bytes on POSIX and unpaired
+        # UTF-16 surrogates in Windows long file names
+        encoded = text.encode('utf-8', 'surrogatepass')
+        if len(encoded.translate(None, self._UNSAFE_BYTES)) == len(encoded):
+            return frozenset()
+        return self.UNSAFE_CHARS.intersection(text)
+
+    def _iter_tree(self, root: str):
+        """
+        Yield (root, rel_dir, depth, dir_names, file_entries) for each folder, top-down.
+
+        Like os.walk, but keeps the os.DirEntry objects for files so names and
+        paths come straight from the directory listing without extra stat()
+        calls. rel_dir is the folder's path relative to the drive ('' for the
+        drive itself). Symlinked folders are listed but not descended into,
+        and unreadable folders are skipped, matching os.walk's defaults.
+
+        Listing a folder mostly waits on the drive, so folders are listed
+        by a pool of threads, each finished folder submitting its
+        subfolders. Every folder is tagged with its position in the tree
+        (the index of each subfolder on the way down) and the results are
+        sorted by it, so they come out in the same order as os.walk and the
+        report does not depend on thread timing. The caller processes them
+        on its own thread, so it needs no locking.
+        """
+        listed = []
+        with ThreadPoolExecutor(max_workers=SCAN_THREADS) as executor:
+            pending = {executor.submit(self._scan_dir, root): (root, '', 0, ())}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, rel_dir, depth, position = pending.pop(future)
+                    result = future.result()
+                    if result is None:
+                        continue
+                    subdirs, dir_names, files = result
+                    listed.append((position, path, rel_dir, depth, dir_names, files))
+
+                    for index, entry in enumerate(subdirs):
+                        child_rel_dir = rel_dir + os.sep + entry.name if rel_dir else entry.name
+                        child = executor.submit(self._scan_dir, entry.path)
+                        pending[child] = (entry.path, child_rel_dir, depth + 1, position + (index,))
+
+        # Tuples sort with a folder's position before its subfolders', which
+        # is the top-down order os.walk uses
+        listed.sort(key=lambda folder: folder[0])
+        for position, path, rel_dir, depth, dir_names, files in listed:
+            yield path, rel_dir, depth, dir_names, files
+
+    def _walk_and_classify(self) -> Dict:
+        """
+        Walk the drive once, collecting structure statistics and the audio worklist.
+
+        Per-file structure issues (path length, filename length, characters)
+        are added to problem_files during the walk and written to the CSV
+        report in batches. Returns a dict with the
+        accumulated counts for verify_structure and, for verify_audio_files,
+        the audio files to analyze (with their result cache keys) and the
+        error lines for unsupported formats.
+        """
         total_files = 0
         total_folders = 0
         root_folders = 0
-        folders_with_files = defaultdict(int)
+        max_folder_count = 0
+        overcrowded_folders = []
         max_nesting = 0
         long_paths = []
         folder_count = 0
-
-        for root, dirs, files in os.walk(self.drive_path):
-            root_path = Path(root)
+        audio_files = []
+        audio_cache_keys = []
+        format_errors = []
+        cache_prefix = self._cache_key_prefix()
+        # Folders whose parent is the drive path are the ones at depth 1; a
+        # drive root such as E:\\ or / is also its own parent
+        drive_is_anchor = self.drive_path.parent == self.drive_path
+        # Bind what the per-file loops use to locals once, so the loops do
+        # not repeat the attribute lookups for every file
+        supported_suffixes = self.SUPPORTED_SUFFIXES
+        unsupported_suffixes = self.UNSUPPORTED_SUFFIXES
+        max_path_length = self.MAX_PATH_LENGTH
+        max_filename_length = self.MAX_FILENAME_LENGTH
+        max_files_per_folder = self.MAX_FILES_PER_FOLDER
+        use_cache = self.use_cache
+        file_stats = self.file_stats
+        unsafe_chars = self._unsafe_chars
+        problem_files = self.problem_files
+        progress_due = self._progress_due
+
+        for root, rel_dir, depth, dirs, files in self._iter_tree(self._drive_str):
             folder_count += 1
+            if len(problem_files) >= CSV_FLUSH_ROWS:
+                self._flush_problem_files()
 
-            # Progress indicator every 100 folders
-            if folder_count % 100 == 0:
-                print(f"  Scanning folder {folder_count}... ({total_files} audio files found so far)", end='\r')
+            # Progress indicator
+            if progress_due():
+                print(f"  Scanning folder {folder_count}... ({total_files} audio files found so far)", end='\r', flush=True)
 
             # Count folders
-            if root_path != self.drive_path:
+            if depth:
                 total_folders += 1
 
             # Count root folders
-            if root_path.parent == self.drive_path:
+            if depth == 1 or (depth == 0 and drive_is_anchor):
                 root_folders += len(dirs)
 
-            # Calculate nesting depth
-            try:
-                relative = root_path.relative_to(self.drive_path)
-                depth = len(relative.parts)
-                max_nesting = max(max_nesting, depth)
-            except ValueError:
-                pass
-
-            # Count files
-            audio_files = [f for f in files if Path(f).suffix.lower() in self.SUPPORTED_FORMATS]
-            total_files += len(audio_files)
-            folders_with_files[root] = len(audio_files)
-
-            # Check path lengths, filenames, and invalid characters
-            for file in files:
-                file_path = root_path / file
-                try:
-                    relative_path = file_path.relative_to(self.drive_path)
-                    path_str = str(relative_path)
-
-                    # Check path length
-                    if len(path_str) > self.MAX_PATH_LENGTH:
-                        long_paths.append((path_str, len(path_str)))
-                        self.problem_files.append({
-                            'file_path': path_str,
-                            'issue_type': 'Path Length',
-                            'severity': 'ERROR',
-                            'description': f'Path length {len(path_str)} exceeds maximum {self.MAX_PATH_LENGTH}'
-                        })
-
-                    # Check filename length
-                    if len(file) > self.MAX_FILENAME_LENGTH:
-                        self.problem_files.append({
-                            'file_path': path_str,
-                            'issue_type': 'Filename Length',
-                            'severity': 'ERROR',
-                            'description': f'Filename length {len(file)} exceeds maximum {self.MAX_FILENAME_LENGTH}'
-                        })
-
-                    # Check for unsafe characters
-                    unsafe_in_path = self.UNSAFE_CHARS.intersection(set(path_str))
-                    if unsafe_in_path:
-                        self.problem_files.append({
-                            'file_path': path_str,
-                            'issue_type': 'Invalid Characters',
-                            'severity': 'WARNING',
-                            'description': f'Path contains extended ASCII characters: {", ".join(sorted(unsafe_in_path))}'
-                        })
-                except ValueError:
-                    pass
-
-        # Clear progress line
-        print(" " * 80, end='\r')
+            max_nesting = max(max_nesting, depth)
+
+            # Classify files by extension: supported audio is queued for
+            # analysis and unsupported formats get their error line here.
+            # The lines are added to self.errors in verify_audio_files, as the
+            # filesystem probe may still be adding its own results meanwhile
+            audio_count = 0
+            for entry in files:
+                name = entry.name.lower()
+                if name.endswith(supported_suffixes):
+                    audio_count += 1
+                    audio_files.append(entry.path)
+                    if use_cache:
+                        # DirEntry.stat() is free on Windows (it comes with
+                        # the listing) and a single stat() call elsewhere
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            audio_cache_keys.append(None)
+                        else:
+                            rel_path = rel_dir + os.sep + entry.name if rel_dir else entry.name
+                            audio_cache_keys.append(f"{cache_prefix}{rel_path}|{st.st_size}|{st.st_mtime_ns}")
+                    file_stats[name[name.rfind('.'):]] += 1
+                elif name.endswith(unsupported_suffixes):
+                    rel_path = rel_dir + os.sep + entry.name if rel_dir else entry.name
+                    format_errors.append(
+                        f"✗ Unsupported format {name[name.rfind('.'):].upper()}: {rel_path}"
+                    )
+            total_files += audio_count
+            # Only audio files count against the per-folder limit
+            if audio_count > max_folder_count:
+                max_folder_count = audio_count
+            if audio_count > max_files_per_folder:
+                overcrowded_folders.append((rel_dir, audio_count))
+
+            # Check path lengths, filenames, and invalid characters. The
+            # folder part is the same for every file here, so measure it once
+            # and only build a file's relative path when it has an issue
+            name_budget = max_path_length - len(rel_dir) - 1 if rel_dir else max_path_length
+            unsafe_in_dir = unsafe_chars(rel_dir)
+
+            # Most folders are clean: when the longest name fits both limits
+            # and every name is ASCII (all UNSAFE_CHARS are non-ASCII), no file
+            # here can have an issue, so skip the per-file checks entirely
+            names = [entry.name for entry in files]
+            if (names and not unsafe_in_dir
+                    and max(map(len, names)) <= min(name_budget, max_filename_length)
+                    and ''.join(names).isascii()):
+                continue
+
+            for entry in files:
+                file = entry.name
+                too_long = len(file) > name_budget
+                unsafe_in_path = unsafe_in_dir.union(unsafe_chars(file))
+                if not (too_long or unsafe_in_path or len(file) > max_filename_length):
+                    continue
+                path_str = rel_dir + os.sep + file if rel_dir else file
+
+                # Check path length
+                if too_long:
+                    long_paths.append((path_str, len(path_str)))
+                    problem_files.append(Issue(
+                        file_path=path_str,
+                        issue_type='Path Length',
+                        severity='ERROR',
+                        description=f'Path length {len(path_str)} exceeds maximum {self.MAX_PATH_LENGTH}'
+                    ))
+
+                # Check filename length
+                if len(file) > max_filename_length:
+                    problem_files.append(Issue(
+                        file_path=path_str,
+                        issue_type='Filename Length',
+                        severity='ERROR',
+                        description=f'Filename length {len(file)} exceeds maximum {self.MAX_FILENAME_LENGTH}'
+                    ))
+
+                # Check for unsafe characters
+                if unsafe_in_path:
+                    problem_files.append(Issue(
+                        file_path=path_str,
+                        issue_type='Invalid Characters',
+                        severity='WARNING',
+                        description=f'Path contains extended ASCII characters: {", ".join(sorted(unsafe_in_path))}'
+                    ))
+
+        self._clear_progress()
+
+        return {
+            'total_files': total_files,
+            'root_folders': root_folders,
+            'max_folder_count': max_folder_count,
+            'overcrowded_folders': overcrowded_folders,
+            'max_nesting': max_nesting,
+            'long_paths': long_paths,
+            'audio_files': audio_files,
+            'audio_cache_keys': audio_cache_keys,
+            'format_errors': format_errors,
+        }
+
+    def verify_structure(self, scan: Optional[Dict] = None):
+        """
+        Verify file and folder structure limits.
+
+        scan is the result of _walk_and_classify; the drive is scanned here
+        if it is not given. The same scan also gathers the audio files for
+        verify_audio_files.
+        """
+        print("\n[2/3] Verifying file and folder structure...")
+
+        if scan is None:
+            scan = self._walk_and_classify()
+        total_files = scan['total_files']
+        root_folders = scan['root_folders']
+        max_folder_count = scan['max_folder_count']
+        overcrowded_folders = scan['overcrowded_folders']
+        max_nesting = scan['max_nesting']
+        long_paths = scan['long_paths']
 
         # Report findings
         if total_files <= self.MAX_TOTAL_FILES:
@@ -411,27 +1137,16 @@ class VolvoUSBVerifier:
             )
 
         # Check files per folder
-        overcrowded_folders = [
-            (folder, count) for folder, count in folders_with_files.items()
-            if count > self.MAX_FILES_PER_FOLDER
-        ]
-
         if not overcrowded_folders:
-            max_folder_count = max(folders_with_files.values()) if folders_with_files else 0
             self.info.append(
                 f"✓ Files per folder: max {max_folder_count} (limit {self.MAX_FILES_PER_FOLDER})"
             )
         else:
             for folder, count in overcrowded_folders[:5]:  # Show first 5
-                try:
-                    rel_folder = Path(folder).relative_to(self.drive_path)
-                    self.errors.append(
-                        f"✗ Folder '{rel_folder}' has {count} files (max {self.MAX_FILES_PER_FOLDER})"
-                    )
-                except ValueError:
-                    self.errors.append(
-                        f"✗ Folder has {count} files (max {self.MAX_FILES_PER_FOLDER})"
-                    )
+                rel_folder = folder or '.'
+                self.errors.append(
+                    f"✗ Folder '{rel_folder}' has {count} files (max {self.MAX_FILES_PER_FOLDER})"
+                )
 
         # Check nesting depth
         if max_nesting <= self.MAX_NESTING_DEPTH:
@@ -452,377 +1167,569 @@ class VolvoUSBVerifier:
             if len(long_paths) > 5:
                 self.errors.append(f"... and {len(long_paths) - 5} more long paths")
 
-    def verify_audio_files(self):
-        """Verify audio file formats, encoding, tags, etc."""
-        self.log("\n[3/3] Verifying audio files...")
-
-        # First pass: collect all audio file paths
-        audio_files = []
-        unsupported_count = 0
+    def verify_audio_files(self, scan: Optional[Dict] = None):
+        """
+        Verify audio file formats, encoding, tags, etc.
 
-        for root, dirs, files in os.walk(self.drive_path):
-            for file in files:
-                file_path = Path(root) / file
-                ext = file_path.suffix.lower()
+        scan is the result of _walk_and_classify (shared with
+        verify_structure); the drive is scanned here if it is not given.
+        """
+        self.log("\n[3/3] Verifying audio files...")
 
-                # Check for unsupported formats
-                if ext in self.UNSUPPORTED_FORMATS:
-                    try:
-                        rel_path = file_path.relative_to(self.drive_path)
-                        self.errors.append(
-                            f"✗ Unsupported format {ext.upper()}: {rel_path}"
-                        )
-                        unsupported_count += 1
-                    except ValueError:
-                        pass
-                    continue
+        if scan is None:
+            scan = self._walk_and_classify()
+        audio_files = scan['audio_files']
 
-                # Collect supported audio files
-                if ext in self.SUPPORTED_FORMATS:
-                    audio_files.append(file_path)
-                    self.file_stats[ext] += 1
+        # Report unsupported formats found by the scan
+        format_errors = scan['format_errors']
+        self.errors.extend(format_errors)
+        unsupported_count = len(format_errors)
 
         total_files = len(audio_files)
         self.log(f"Found {total_files} audio files to analyze{f' ({unsupported_count} unsupported)' if unsupported_count else ''}...")
 
-        # Second pass: analyze files in parallel
-        problem_files = []
+        # Files unchanged since an earlier run (same size and modification
+        # time) reuse that run's result; only the rest go to the workers
+        cache = self._load_result_cache() if self.use_cache else {}
+        keys = scan['audio_cache_keys'] if self.use_cache else [None] * total_files
+        pending = [file_path for file_path, key in zip(audio_files, keys) if key not in cache]
+        fresh_results = {}
+
+        # Analyze files in parallel. Only the first ISSUE_PREVIEW_LINES issue
+        # lines are printed, so keep just those plus a running count
+        issue_preview = []
+        issue_count = 0
         processed = 0
+        problem_files = self.problem_files
+
+        # Hand each worker batches of files to amortize the inter-process
+        # round trips, but keep batches small enough to spread short lists.
+        # The walk lists each folder's files together in directory order, so
+        # a batch is a run of sibling files and each worker reads (and reads
+        # ahead) one area of the drive instead of interleaving folders. Do
+        # not sort by name here: directory order follows the order the files
+        # were copied, which is also how FAT lays out their clusters
+        chunksize = max(1, min(AUDIO_CHUNK_SIZE, len(pending) // (self.num_workers * 4)))
+        batches = [pending[i:i + chunksize] for i in range(0, len(pending), chunksize)]
+
+        if len(pending) <= THREADED_AUDIO_FILES:
+            # A short worklist, such as a rerun where most results are
+            # cached, takes less time to check than starting worker processes
+            # would (on Windows and macOS each one imports this module and
+            # mutagen again). Threads still overlap the reads from the drive
+            executor = ThreadPoolExecutor(max_workers=SCAN_THREADS)
+            batch_worker = functools.partial(_verify_audio_batch_worker, verifier=self)
+        else:
+            # Each worker builds its verifier once at start-up, so batches
+            # carry nothing but file paths. On Linux, fork the workers so they
+            # start with this module already imported (newer Pythons default
+            # to forkserver there); fork is unsafe on macOS and missing on
+            # Windows
+            mp_context = multiprocessing.get_context('fork') if SYSTEM == 'Linux' else None
+            executor = ProcessPoolExecutor(max_workers=self.num_workers, mp_context=mp_context,
+                                           initializer=_init_audio_worker,
+                                           initargs=(self._drive_str,))
+            batch_worker = _verify_audio_batch_worker
+
+        with executor:
+            results = (
+                result
+                for batch_results in executor.map(batch_worker, batches)
+                for result in batch_results
+            )
 
-        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-            # Submit all file verification tasks
-            future_to_file = {
-                executor.submit(self._verify_audio_file, file_path): file_path
-                for file_path in audio_files
-            }
-
-            # Process results as they complete
-            for future in as_completed(future_to_file):
+            # Results arrive in submission order, so cached and fresh results
+            # are merged back in drive order
+            for file_path, key in zip(audio_files, keys):
+                if key in cache:
+                    # JSON turns the cached tuples into lists
+                    cached = cache[key]
+                    file_issues = (cached[0], [Issue(*row) for row in cached[1]]) if cached else None
+                    error = None
+                else:
+                    file_issues, error = next(results)
+                    # Read errors may be transient (e.g. a USB hiccup), so
+                    # those files are checked again on the next run
+                    if (error is None and key is not None
+                            and not (file_issues and any(row.issue_type == 'Read Error'
+                                                         for row in file_issues[1]))):
+                        fresh_results[key] = file_issues
                 processed += 1
 
-                # Progress indicator every 500 files
-                if processed % 500 == 0 or processed == total_files:
-                    print(f"  Analyzed {processed}/{total_files} files... ({len(problem_files)} issues found)", end='\r')
+                # Progress indicator
+                if self._progress_due():
+                    print(f"  Analyzed {processed}/{total_files} files... ({issue_count} issues found)", end='\r', flush=True)
 
-                try:
-                    file_issues = future.result()
+                if error is None:
                     if file_issues:
-                        problem_files.extend(file_issues['display'])
-                        self.problem_files.extend(file_issues['csv'])
-                except Exception as e:
-                    file_path = future_to_file[future]
-                    try:
-                        rel_path = file_path.relative_to(self.drive_path)
-                        error_msg = f"⚠ Error processing {rel_path}: {e}"
-                        problem_files.append(error_msg)
-                        self.problem_files.append({
-                            'file_path': str(rel_path),
-                            'issue_type': 'Processing Error',
-                            'severity': 'Error',
-                            'description': str(e)
-                        })
-                    except ValueError:
-                        problem_files.append(f"⚠ Error processing file: {e}")
-
-        # Clear progress line
-        print(" " * 80, end='\r')
+                        display, rows = file_issues
+                        issue_count += len(display)
+                        issue_preview.extend(display[:ISSUE_PREVIEW_LINES - len(issue_preview)])
+                        problem_files.extend(rows)
+                else:
+                    rel_path = file_path[self._drive_prefix_len:]
+                    issue_count += 1
+                    if len(issue_preview) < ISSUE_PREVIEW_LINES:
+                        issue_preview.append(f"⚠ Error processing {rel_path}: {error}")
+                    problem_files.append(Issue(
+                        file_path=rel_path,
+                        issue_type='Processing Error',
+                        severity='Error',
+                        description=error
+                    ))
+
+                if len(problem_files) >= CSV_FLUSH_ROWS:
+                    self._flush_problem_files()
+
+        if self.use_cache:
+            self._save_result_cache(cache, keys, fresh_results)
+
+        self._clear_progress()
 
         # Report statistics
-        self.log(f"\nScanned {total_files} audio files:")
-        for ext, count in sorted(self.file_stats.items()):
-            self.log(f"  {ext.upper()}: {count}")
+        lines = [f"\nScanned {total_files} audio files:"]
+        lines.extend(f"  {ext.upper()}: {count}" for ext, count in sorted(self.file_stats.items()))
 
         # Report issues (limit output)
-        if problem_files:
-            self.log(f"\nFound {len(problem_files)} file issues (showing first 20):")
-            for issue in problem_files[:20]:
-                self.log(f"  {issue}")
-            if len(problem_files) > 20:
-                self.log(f"  ... and {len(problem_files) - 20} more issues")
-
-    def _verify_audio_file(self, file_path: Path) -> Optional[Dict]:
-        """Verify a single audio file. Returns dict with display and CSV data."""
-        display_issues = []
-        csv_issues = []
-        ext = file_path.suffix.lower()
+        if issue_count:
+            lines.append(f"\nFound {issue_count} file issues (showing first {ISSUE_PREVIEW_LINES}):")
+            lines.extend(f"  {issue}" for issue in issue_preview)
+            if issue_count > len(issue_preview):
+                lines.append(f"  ... and {issue_count - len(issue_preview)} more issues")
+
+        self.log_lines(lines)
 
+    def _cache_key_prefix(self) -> str:
+        """Prefix shared by the result cache keys of every file on this drive."""
+        return f"{os.path.abspath(self._drive_str)}|"
+
+    def _load_result_cache(self) -> Dict:
+        """Load cached audio results for this drive. A missing or unreadable cache is empty."""
         try:
-            rel_path = file_path.relative_to(self.drive_path)
-        except ValueError:
-            rel_path = file_path.name
+            with open(self.result_cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != RESULT_CACHE_VERSION:
+            return {}
+        return data.get('results', {})
+
+    def _save_result_cache(self, cache: Dict, keys: List[str], fresh_results: Dict):
+        """
+        Write the result cache back. Cache failures are never fatal.
+
+        Entries for this drive are replaced by the results of this run, so
+        files that were changed or removed do not pile up; entries for other
+        drives are kept.
+        """
+        prefix = self._cache_key_prefix()
+        results = {key: value for key, value in cache.items() if not key.startswith(prefix)}
+        for key in keys:
+            if key in cache:
+                results[key] = cache[key]
+        results.update(fresh_results)
 
         try:
-            if ext == '.mp3':
-                display_issues, csv_issues = self._verify_mp3(file_path, rel_path)
-            elif ext == '.wma':
-                display_issues, csv_issues = self._verify_wma(file_path, rel_path)
-            elif ext in {'.m4a', '.m4b', '.aac'}:
-                display_issues, csv_issues = self._verify_aac_m4a(file_path, rel_path)
+            self.result_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.result_cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': RESULT_CACHE_VERSION, 'results': results}, f)
+            os.replace(tmp_path, self.result_cache_path)
+        except OSError:
+            pass
+
+    def _verify_audio_file(self, file_path: str) -> Optional[FileIssues]:
+        """Verify a single audio file. Returns (display_issues, csv_issues), or None if it has no issues."""
+        handler = self._ext_handlers.get(self._extension(os.path.basename(file_path)))
+        if handler is None:
+            return None
+
+        rel_path = file_path[self._drive_prefix_len:]
+
+        # Messages are only formatted once an issue is found, so a clean
+        # file costs no string building here or in the handlers
+        try:
+            display_issues, csv_issues = handler(file_path, rel_path)
         except Exception as e:
-            display_issues.append(f"⚠ Error reading {rel_path}: {e}")
-            csv_issues.append({
-                'file_path': str(rel_path),
-                'issue_type': 'Read Error',
-                'severity': 'Error',
-                'description': str(e)
-            })
+            display_issues = [f"⚠ Error reading {rel_path}: {e}"]
+            csv_issues = [Issue(
+                file_path=rel_path,
+                issue_type='Read Error',
+                severity='Error',
+                description=str(e)
+            )]
 
         if display_issues:
-            return {'display': display_issues, 'csv': csv_issues}
+            return display_issues, csv_issues
         return None
 
-    def _verify_mp3(self, file_path: Path, rel_path: Path) -> Tuple[List[str], List[Dict]]:
+    @staticmethod
+    def _read_error(rel_path: str, error: Exception, file_format: str) -> Tuple[str, Issue]:
+        """Build the console line and CSV row for a file a format check could not read."""
+        return f"⚠ {rel_path}: Error reading {file_format}: {error}", Issue(
+            file_path=rel_path,
+            issue_type='Read Error',
+            severity='Error',
+            description=str(error)
+        )
+
+    def _verify_mp3(self, file_path: str, rel_path: str) -> Tuple[List[str], List[Issue]]:
         """Verify MP3 file specifics. Returns (display_issues, csv_issues)."""
+        from mutagen.mp3 import MP3, MPEGInfo
+
         display_issues = []
         csv_issues = []
 
         try:
-            audio = MP3(file_path)
+            with _mapped_file(file_path) as fileobj:
+                # Read the tag layout directly where possible so embedded
+                # artwork is never loaded; mutagen handles everything else
+                id3 = _scan_id3v2(fileobj)
+                stream = None
+                if id3 is not None:
+                    tag_version, tag_size, image_sizes = id3
+                    # Plain CBR streams are decoded directly from their frame
+                    # headers; VBR headers and anything unusual go to mutagen
+                    stream = _scan_cbr_mpeg_stream(fileobj, tag_size)
+                    if stream is None:
+                        info = MPEGInfo(fileobj, tag_size)
+                elif _is_untagged(fileobj):
+                    # No ID3v2 header and no ID3v1 footer: there are no tags
+                    # for mutagen to parse, so only the stream needs reading
+                    tag_version = None
+                    stream = _scan_cbr_mpeg_stream(fileobj, 0)
+                    if stream is None:
+                        info = MPEGInfo(fileobj)
+                else:
+                    fileobj.seek(0)
+                    audio = MP3(fileobj)
+                    info = audio.info
+                    if audio.tags:
+                        tag_version = audio.tags.version
+                        # getall looks the APIC frames up by key instead of
+                        # walking every frame in the tag
+                        image_sizes = [
+                            len(frame.data) for frame in audio.tags.getall('APIC')
+                            if hasattr(frame, 'data')
+                        ]
+                    else:
+                        tag_version = None
+
+            if stream is not None:
+                bitrate, sample_rate = stream
+                is_vbr = False
+            else:
+                bitrate, sample_rate = info.bitrate, info.sample_rate
+                is_vbr = 'VBR' in str(getattr(info, 'bitrate_mode', '')).upper()
 
             # Check bitrate
-            if audio.info.bitrate:
-                bitrate_kbps = audio.info.bitrate // 1000
+            if bitrate:
+                bitrate_kbps = bitrate // 1000
 
                 if bitrate_kbps == self.FORBIDDEN_BITRATE:
                     msg = f"✗ {rel_path}: 144 kbps is explicitly not supported"
                     display_issues.append(msg)
-                    csv_issues.append({
-                        'file_path': str(rel_path),
-                        'issue_type': 'Bitrate',
-                        'severity': 'Error',
-                        'description': '144 kbps is forbidden'
-                    })
+                    csv_issues.append(Issue(
+                        file_path=rel_path,
+                        issue_type='Bitrate',
+                        severity='Error',
+                        description='144 kbps is forbidden'
+                    ))
                 elif bitrate_kbps < self.MIN_BITRATE or bitrate_kbps > self.MAX_BITRATE:
                     msg = f"⚠ {rel_path}: bitrate {bitrate_kbps} kbps outside supported range ({self.MIN_BITRATE}-{self.MAX_BITRATE})"
                     display_issues.append(msg)
-                    csv_issues.append({
-                        'file_path': str(rel_path),
-                        'issue_type': 'Bitrate',
-                        'severity': 'Warning',
-                        'description': f'{bitrate_kbps} kbps (range: {self.MIN_BITRATE}-{self.MAX_BITRATE})'
-                    })
+                    csv_issues.append(Issue(
+                        file_path=rel_path,
+                        issue_type='Bitrate',
+                        severity='Warning',
+                        description=f'{bitrate_kbps} kbps (range: {self.MIN_BITRATE}-{self.MAX_BITRATE})'
+                    ))
 
             # Check sample rate
-            if audio.info.sample_rate not in self.VALID_SAMPLE_RATES:
-                msg = f"⚠ {rel_path}: sample rate {audio.info.sample_rate} Hz (recommended: 44100 Hz)"
+            if sample_rate not in self.VALID_SAMPLE_RATES:
+                msg = f"⚠ {rel_path}: sample rate {sample_rate} Hz (recommended: 44100 Hz)"
                 display_issues.append(msg)
-                csv_issues.append({
-                    'file_path': str(rel_path),
-                    'issue_type': 'Sample Rate',
-                    'severity': 'Warning',
-                    'description': f'{audio.info.sample_rate} Hz (recommended: 32000, 44100, or 48000 Hz)'
-                })
+                csv_issues.append(Issue(
+                    file_path=rel_path,
+                    issue_type='Sample Rate',
+                    severity='Warning',
+                    description=f'{sample_rate} Hz (recommended: 32000, 44100, or 48000 Hz)'
+                ))
 
             # Check if VBR
-            if hasattr(audio.info, 'bitrate_mode'):
-                if 'VBR' in str(audio.info.bitrate_mode).upper():
-                    msg = f"⚠ {rel_path}: VBR encoding (CBR strongly recommended)"
-                    display_issues.append(msg)
-                    csv_issues.append({
-                        'file_path': str(rel_path),
-                        'issue_type': 'Encoding',
-                        'severity': 'Warning',
-                        'description': 'VBR encoding (CBR strongly recommended)'
-                    })
+            if is_vbr:
+                msg = f"⚠ {rel_path}: VBR encoding (CBR strongly recommended)"
+                display_issues.append(msg)
+                csv_issues.append(Issue(
+                    file_path=rel_path,
+                    issue_type='Encoding',
+                    severity='Warning',
+                    description='VBR encoding (CBR strongly recommended)'
+                ))
 
             # Check ID3 tags
-            if audio.tags:
-                tag_display, tag_csv = self._verify_id3_tags(audio.tags, rel_path)
+            if tag_version is not None:
+                tag_display, tag_csv = self._verify_id3_tags(tag_version, image_sizes, rel_path)
                 display_issues.extend(tag_display)
                 csv_issues.extend(tag_csv)
             else:
                 msg = f"⚠ {rel_path}: No ID3 tags found"
                 display_issues.append(msg)
-                csv_issues.append({
-                    'file_path': str(rel_path),
-                    'issue_type': 'ID3 Tags',
-                    'severity': 'Warning',
-                    'description': 'No ID3 tags found'
-                })
+                csv_issues.append(Issue(
+                    file_path=rel_path,
+                    issue_type='ID3 Tags',
+                    severity='Warning',
+                    description='No ID3 tags found'
+                ))
 
         except Exception as e:
-            msg = f"⚠ {rel_path}: Error reading MP3: {e}"
+            msg, issue = self._read_error(rel_path, e, 'MP3')
             display_issues.append(msg)
-            csv_issues.append({
-                'file_path': str(rel_path),
-                'issue_type': 'Read Error',
-                'severity': 'Error',
-                'description': str(e)
-            })
+            csv_issues.append(issue)
 
         return display_issues, csv_issues
 
-    def _verify_id3_tags(self, tags, rel_path: Path) -> Tuple[List[str], List[Dict]]:
-        """Verify ID3 tag version and encoding."""
+    def _verify_id3_tags(self, version: Tuple[int, int, int], image_sizes: List[int],
+                         rel_path: str) -> Tuple[List[str], List[Issue]]:
+        """Verify ID3 tag version and embedded artwork sizes."""
         display_issues = []
         csv_issues = []
 
         # Check ID3 version
-        if hasattr(tags, 'version'):
-            major, minor, rev = tags.version
+        if version:
+            major, minor, rev = version
             if major == 2 and minor == 3:
                 pass  # ID3v2.3 is ideal
             elif major == 2 and minor == 4:
                 msg = f"⚠ {rel_path}: ID3v2.4 tags (ID3v2.3 recommended for compatibility)"
                 display_issues.append(msg)
-                csv_issues.append({
-                    'file_path': str(rel_path),
-                    'issue_type': 'ID3 Tags',
-                    'severity': 'Warning',
-                    'description': 'ID3v2.4 (ID3v2.3 recommended)'
-                })
+                csv_issues.append(Issue(
+                    file_path=rel_path,
+                    issue_type='ID3 Tags',
+                    severity='Warning',
+                    description='ID3v2.4 (ID3v2.3 recommended)'
+                ))
             elif major == 1:
                 pass  # ID3v1 is acceptable
             else:
                 msg = f"⚠ {rel_path}: Unusual ID3 version {major}.{minor}"
                 display_issues.append(msg)
-                csv_issues.append({
-                    'file_path': str(rel_path),
-                    'issue_type': 'ID3 Tags',
-                    'severity': 'Warning',
-                    'description': f'Unusual ID3 version {major}.{minor}'
-                })
+                csv_issues.append(Issue(
+                    file_path=rel_path,
+                    issue_type='ID3 Tags',
+                    severity='Warning',
+                    description=f'Unusual ID3 version {major}.{minor}'
+                ))
 
         # Check for embedded images (album art)
-        image_frames = [frame for frame in tags.values() if frame.FrameID == 'APIC']
-        for img_frame in image_frames:
-            if hasattr(img_frame, 'data'):
-                img_size = len(img_frame.data)
-                if img_size > 500 * 500 * 3:  # Rough estimate
-                    msg = f"⚠ {rel_path}: Large embedded artwork ({img_size // 1024} KB, keep under ~750 KB)"
-                    display_issues.append(msg)
-                    csv_issues.append({
-                        'file_path': str(rel_path),
-                        'issue_type': 'Album Art',
-                        'severity': 'Warning',
-                        'description': f'Large artwork: {img_size // 1024} KB'
-                    })
+        for img_size in image_sizes:
+            if img_size > 500 * 500 * 3:  # Rough estimate
+                msg = f"⚠ {rel_path}: Large embedded artwork ({img_size // 1024} KB, keep under ~750 KB)"
+                display_issues.append(msg)
+                csv_issues.append(Issue(
+                    file_path=rel_path,
+                    issue_type='Album Art',
+                    severity='Warning',
+                    description=f'Large artwork: {img_size // 1024} KB'
+                ))
 
         return display_issues, csv_issues
 
-    def _verify_wma(self, file_path: Path, rel_path: Path) -> Tuple[List[str], List[Dict]]:
+    def _verify_wma(self, file_path: str, rel_path: str) -> Tuple[List[str], List[Issue]]:
         """Verify WMA file specifics."""
+        from mutagen.asf import ASF
+
         display_issues = []
         csv_issues = []
 
         try:
-            audio = ASF(file_path)
+            with _mapped_file(file_path) as fileobj:
+                audio = ASF(fileobj)
 
             # Basic checks
-            if audio.info.bitrate:
-                bitrate_kbps = audio.info.bitrate // 1000
+            bitrate = audio.info.bitrate
+            if bitrate:
+                bitrate_kbps = bitrate // 1000
                 if bitrate_kbps < self.MIN_BITRATE or bitrate_kbps > self.MAX_BITRATE:
                     msg = f"⚠ {rel_path}: bitrate {bitrate_kbps} kbps outside typical range ({self.MIN_BITRATE}-{self.MAX_BITRATE})"
                     display_issues.append(msg)
-                    csv_issues.append({
-                        'file_path': str(rel_path),
-                        'issue_type': 'Bitrate',
-                        'severity': 'Warning',
-                        'description': f'{bitrate_kbps} kbps (range: {self.MIN_BITRATE}-{self.MAX_BITRATE})'
-                    })
+                    csv_issues.append(Issue(
+                        file_path=rel_path,
+                        issue_type='Bitrate',
+                        severity='Warning',
+                        description=f'{bitrate_kbps} kbps (range: {self.MIN_BITRATE}-{self.MAX_BITRATE})'
+                    ))
 
         except Exception as e:
-            msg = f"⚠ {rel_path}: Error reading WMA: {e}"
+            msg, issue = self._read_error(rel_path, e, 'WMA')
             display_issues.append(msg)
-            csv_issues.append({
-                'file_path': str(rel_path),
-                'issue_type': 'Read Error',
-                'severity': 'Error',
-                'description': str(e)
-            })
+            csv_issues.append(issue)
 
         return display_issues, csv_issues
 
-    def _verify_aac_m4a(self, file_path: Path, rel_path: Path) -> Tuple[List[str], List[Dict]]:
+    def _verify_aac_m4a(self, file_path: str, rel_path: str) -> Tuple[List[str], List[Issue]]:
         """Verify AAC/M4A/M4B file specifics."""
+        MP4 = _mp4_class()
+
         display_issues = []
         csv_issues = []
 
         try:
-            audio = MP4(file_path)
-
-            # Check for DRM (FairPlay)
-            if hasattr(audio, 'info'):
-                # M4P files are typically DRM-protected
-                if file_path.suffix.lower() == '.m4p':
-                    msg = f"✗ {rel_path}: .m4p file likely has DRM (iTunes protected)"
-                    display_issues.append(msg)
-                    csv_issues.append({
-                        'file_path': str(rel_path),
-                        'issue_type': 'DRM',
-                        'severity': 'Error',
-                        'description': 'iTunes DRM protected (m4p)'
-                    })
-
-            # Check sample rate
-            if hasattr(audio.info, 'sample_rate'):
-                if audio.info.sample_rate < 8000 or audio.info.sample_rate > 96000:
-                    msg = f"⚠ {rel_path}: sample rate {audio.info.sample_rate} Hz outside supported range (8-96 kHz)"
-                    display_issues.append(msg)
-                    csv_issues.append({
-                        'file_path': str(rel_path),
-                        'issue_type': 'Sample Rate',
-                        'severity': 'Warning',
-                        'description': f'{audio.info.sample_rate} Hz (range: 8-96 kHz)'
-                    })
+            with _mapped_file(file_path) as fileobj:
+                if not _is_mp4_container(fileobj):
+                    # Same message mutagen gives when it finds no moov atom
+                    raise ValueError("not a MP4 file")
+                audio = MP4(fileobj)
+
+            # Check sample rate (MP4Info always has one; 0 if unknown)
+            sample_rate = audio.info.sample_rate
+            if sample_rate not in self.VALID_AAC_SAMPLE_RATES:
+                msg = f"⚠ {rel_path}: sample rate {sample_rate} Hz is not a standard AAC rate (8-96 kHz)"
+                display_issues.append(msg)
+                csv_issues.append(Issue(
+                    file_path=rel_path,
+                    issue_type='Sample Rate',
+                    severity='Warning',
+                    description=f'{sample_rate} Hz (not a standard AAC rate, 8-96 kHz)'
+                ))
 
         except Exception as e:
-            msg = f"⚠ {rel_path}: Error reading AAC/M4A: {e}"
+            msg, issue = self._read_error(rel_path, e, 'AAC/M4A')
             display_issues.append(msg)
-            csv_issues.append({
-                'file_path': str(rel_path),
-                'issue_type': 'Read Error',
-                'severity': 'Error',
-                'description': str(e)
-            })
+            csv_issues.append(issue)
 
         return display_issues, csv_issues
 
+    @property
+    def problem_count(self) -> int:
+        """Number of problem files found, whether or not they are written yet."""
+        return self._problem_rows_written + len(self.problem_files)
+
+    def _flush_problem_files(self):
+        """Write the pending problem_files rows to the CSV report and clear them."""
+        rows = self.problem_files
+        if not self.csv_file or not rows:
+            return
+
+        if self._csv_error is None:
+            try:
+                # The report is created with its first row, so a clean drive
+                # leaves no CSV behind. A large buffer lets the rows go out
+                # in a few writes
+                if self._csv_writer is None:
+                    self._csv_out = open(self.csv_file, 'w', newline='', encoding='utf-8',
+                                         buffering=1 << 20)
+                    self._csv_writer = csv.writer(self._csv_out)
+                    self._csv_writer.writerow(Issue._fields)
+                self._csv_writer.writerows(rows)
+            except Exception as e:
+                self._csv_error = e
+
+        self._problem_rows_written += len(rows)
+        # Clear in place: the scan loops hold a reference to this list
+        rows.clear()
+
     def export_csv(self):
-        """Export all problem files to CSV."""
+        """Write the remaining problem files and close the CSV report."""
         if not self.csv_file:
             return
 
-        try:
-            with open(self.csv_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['file_path', 'issue_type', 'severity', 'description'])
-                writer.writeheader()
-                writer.writerows(self.problem_files)
-
+        self._flush_problem_files()
+        if self._csv_out is not None:
+            try:
+                self._csv_out.close()
+            except Exception as e:
+                if self._csv_error is None:
+                    self._csv_error = e
+            self._csv_out = self._csv_writer = None
+
+        if self._csv_error is not None:
+            self.log(f"\n⚠ Error exporting CSV: {self._csv_error}")
+        elif self._problem_rows_written:
             self.log(f"\nCSV report exported to: {self.csv_file}")
-            self.log(f"Total problem files: {len(self.problem_files)}")
-        except Exception as e:
-            self.log(f"\n⚠ Error exporting CSV: {e}")
+            self.log(f"Total problem files: {self._problem_rows_written}")
 
     def print_report(self):
         """Print comprehensive verification report."""
-        self.log("\n" + "=" * 70)
-        self.log("VERIFICATION REPORT")
-        self.log("=" * 70)
+        lines = ["\n" + REPORT_RULE, "VERIFICATION REPORT", REPORT_RULE]
 
         if self.info:
-            self.log("\n✓ PASSED CHECKS:")
-            for item in self.info:
-                self.log(f"  {item}")
+            lines.append("\n✓ PASSED CHECKS:")
+            lines.extend(f"  {item}" for item in self.info)
 
         if self.warnings:
-            self.log(f"\n⚠ WARNINGS ({len(self.warnings)}):")
-            for item in self.warnings:
-                self.log(f"  {item}")
+            lines.append(f"\n⚠ WARNINGS ({len(self.warnings)}):")
+            lines.extend(f"  {item}" for item in self.warnings)
 
         if self.errors:
-            self.log(f"\n✗ ERRORS ({len(self.errors)}):")
-            for item in self.errors:
-                self.log(f"  {item}")
+            lines.append(f"\n✗ ERRORS ({len(self.errors)}):")
+            lines.extend(f"  {item}" for item in self.errors)
 
-        self.log("\n" + "=" * 70)
+        lines.append("\n" + REPORT_RULE)
         if not self.errors:
-            self.log("✓ RESULT: Drive appears compatible with Volvo XC70 2012!")
-            self.log("\nRecommendation: Test with a small subset of files first.")
+            lines.append("✓ RESULT: Drive appears compatible with Volvo XC70 2012!")
+            lines.append("\nRecommendation: Test with a small subset of files first.")
         else:
-            self.log("✗ RESULT: Issues found that may prevent proper operation.")
-            self.log("\nRecommendation: Address errors above before using in vehicle.")
-        self.log("=" * 70)
+            lines.append("✗ RESULT: Issues found that may prevent proper operation.")
+            lines.append("\nRecommendation: Address errors above before using in vehicle.")
+        lines.append(REPORT_RULE)
+
+        self.log_lines(lines)
+
+
+# Verifier used by the format checks in a worker process (set by _init_audio_worker)
+_worker_verifier = None
+
+
+def _init_audio_worker(drive_path: str):
+    """Create the worker process's verifier once, when the process starts."""
+    global _worker_verifier
+    _worker_verifier = VolvoUSBVerifier(drive_path)
+
+
+def _verify_audio_file_worker(file_path: str, verifier: Optional['VolvoUSBVerifier'] = None
+                              ) -> Tuple[Optional[FileIssues], Optional[str]]:
+    """
+    Verify one audio file in a worker process (or with verifier, in a thread).
+
+    Returns (file_issues, error): the result of
+    VolvoUSBVerifier._verify_audio_file, or the error message if the check
+    itself failed.
+    """
+    try:
+        return (verifier or _worker_verifier)._verify_audio_file(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _prefetch_headers(file_paths: List[str]):
+    """
+    Ask the OS to start reading the start of each file in the background.
+
+    The reads overlap with parsing the earlier files of the batch, so mutagen
+    rarely waits on the USB drive. Does nothing where posix_fadvise is not
+    available (Windows).
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for file_path in file_paths:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, HEADER_PREFETCH_SIZE, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _verify_audio_batch_worker(file_paths: List[str], verifier: Optional['VolvoUSBVerifier'] = None
+                               ) -> List[Tuple[Optional[FileIssues], Optional[str]]]:
+    """Verify a batch of audio files in a worker process, prefetching their headers first."""
+    _prefetch_headers(file_paths)
+    return [_verify_audio_file_worker(file_path, verifier) for file_path in file_paths]
 
 
 def setup_logging(drive_path: str) -> Tuple[str, str]:
@@ -832,7 +1739,7 @@ def setup_logging(drive_path: str) -> Tuple[str, str]:
     log_dir.mkdir(exist_ok=True)
 
     # Create timestamped log filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     drive_name = Path(drive_path).name or "drive"
     log_file = log_dir / f"volvo_verify_{drive_name}_{timestamp}.log"
     csv_file = log_dir / f"volvo_verify_{drive_name}_{timestamp}.csv"
@@ -847,24 +1754,55 @@ def setup_logging(drive_path: str) -> Tuple[str, str]:
     file_formatter = logging.Formatter('%(message)s')
     file_handler.setFormatter(file_formatter)
 
+    # Buffer records so the log file is written in blocks rather than
+    # once per checked file; main() flushes the rest on exit
+    memory_handler = logging.handlers.MemoryHandler(1024, target=file_handler)
+    memory_handler.setLevel(logging.INFO)
+
     # Add handlers
-    logger.addHandler(file_handler)
+    logger.addHandler(memory_handler)
 
     return str(log_file), str(csv_file)
 
 
 def main():
     """Main entry point."""
-    if len(sys.argv) < 2:
+    args = []
+    use_cache = True
+    result_cache_path = RESULT_CACHE_PATH
+    num_workers = None
+    argv = iter(sys.argv[1:])
+    for arg in argv:
+        if arg == '--no-cache':
+            use_cache = False
+        elif arg == '--cache':
+            result_cache_path = next(argv, None)
+            if result_cache_path is None:
+                print("ERROR: --cache requires a file path")
+                sys.exit(1)
+        elif arg == '--jobs':
+            value = next(argv, '')
+            if not value.isdigit() or int(value) < 1:
+                print("ERROR: --jobs requires a positive number of processes")
+                sys.exit(1)
+            num_workers = int(value)
+        else:
+            args.append(arg)
+
+    if not args:
         print("Volvo XC70 2012 USB Media Drive Verifier")
-        print("\nUsage: python volvo_usb_verifier.py <drive_path>")
+        print("\nUsage: python volvo_usb_verifier.py <drive_path> [--no-cache] [--cache <path>] [--jobs N]")
         print("\nExamples:")
         print("  Windows: python volvo_usb_verifier.py E:\\")
         print("  Linux:   python volvo_usb_verifier.py /media/usb")
         print("  macOS:   python volvo_usb_verifier.py /Volumes/USB_DRIVE")
+        print("\n--no-cache re-checks every audio file instead of reusing results")
+        print("for files unchanged since the last run. --cache <path> stores the")
+        print(f"results in <path> instead of {RESULT_CACHE_PATH}.")
+        print("--jobs N analyzes audio files with N processes (default: one per CPU).")
         sys.exit(1)
 
-    drive_path = sys.argv[1]
+    drive_path = args[0]
 
     if not os.path.exists(drive_path):
         print(f"ERROR: Path does not exist: {drive_path}")
@@ -878,12 +1816,14 @@ def main():
     log_file, csv_file = setup_logging(drive_path)
     print(f"Logging to: {log_file}\n")
 
-    verifier = VolvoUSBVerifier(drive_path)
+    verifier = VolvoUSBVerifier(drive_path, num_workers=num_workers, use_cache=use_cache,
+                                result_cache_path=result_cache_path)
     verifier.csv_file = csv_file
     success = verifier.verify_all()
+    logging.shutdown()
 
     print(f"\nLog file saved to: {log_file}")
-    if verifier.problem_files:
+    if verifier.problem_count:
         print(f"CSV report saved to: {csv_file}")
 
     sys.exit(0 if success else 1)